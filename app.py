@@ -1,13 +1,17 @@
 # app.py  –  Soundboard Pro
 import tkinter as tk
 from tkinter import messagebox
-import traceback, os, shutil
+import traceback
+import threading
+import multiprocessing
+import collections
 
-from config  import load_config, save_config
+from config  import load_config, save_config, flush_config
 from version import __version__
 import themes as T
 
-from effects import init_sound_effects, get_active_effects, toggle_effect, EFFECTS
+from effects import (init_sound_effects, get_active_effects, toggle_effect,
+                     is_rendering, EFFECTS)
 
 _ae = None
 _sm = None
@@ -16,6 +20,10 @@ sounds = {}
 config   = None
 root     = None
 _current_refresh = None
+_current_on_events = None   # handles a batch of engine events for the main view
+
+_ui_events = collections.deque()   # engine events waiting for the Tk loop
+_ui_wake   = [False]               # a delivery is already scheduled
 
 
 def _c(n): return getattr(T, n)
@@ -57,6 +65,34 @@ def _init_audio():
         traceback.print_exc()
 
 
+# ─────────────────────────────────────────────────────────────
+# ENGINE EVENTS
+# ─────────────────────────────────────────────────────────────
+# A daemon thread blocks on the engine's event queue and wakes the Tk loop
+# with one after() per batch; events arriving before it runs join that
+# batch. Nothing runs while the board is idle.
+def _start_event_pump():
+    def _pump():
+        while True:
+            _ui_events.append(_ae.wait_event())
+            if not _ui_wake[0]:
+                _ui_wake[0] = True
+                try:
+                    root.after(0, _deliver_events)
+                except Exception:
+                    return   # window gone
+    threading.Thread(target=_pump, daemon=True).start()
+
+
+def _deliver_events():
+    _ui_wake[0] = False
+    batch = []
+    while _ui_events:
+        batch.append(_ui_events.popleft())
+    if batch and _current_on_events:
+        _current_on_events(batch)
+
+
 # ─────────────────────────────────────────────────────────────
 # SCROLL
 # ─────────────────────────────────────────────────────────────
@@ -74,20 +110,11 @@ def _bind_scroll(canvas, widget=None):
 def _setup_drag_drop(widget):
     try:
         def _drop(event):
-            imported = 0
-            for fp in root.tk.splitlist(event.data):
-                if fp.lower().endswith((".mp3",".wav",".ogg",".flac")):
-                    try:
-                        os.makedirs(_sm.SOUNDS_DIR, exist_ok=True)
-                        shutil.copy2(fp, os.path.join(_sm.SOUNDS_DIR, os.path.basename(fp)))
-                        imported += 1
-                    except Exception as e: print(f"[drop] {e}")
-            if imported:
-                _sm.load_sounds()
-                for s in _sm.sounds.values(): init_sound_effects(s)
-                globals()["sounds"] = _sm.sounds
+            added = _sm.import_files(root.tk.splitlist(event.data))
+            if added:
+                for n in added: init_sound_effects(_sm.sounds[n])
                 if _current_refresh: _current_refresh()
-                messagebox.showinfo("Imported", f"Imported {imported} file(s)!")
+                messagebox.showinfo("Imported", f"Imported {len(added)} file(s)!")
         widget.drop_target_register("DND_Files")
         widget.dnd_bind("<<Drop>>", _drop)
     except Exception: pass
@@ -224,7 +251,7 @@ def _effect_popup(sound_name, anchor_btn, refresh_badges):
 # MAIN UI
 # ─────────────────────────────────────────────────────────────
 def build_main_app():
-    global _current_refresh
+    global _current_refresh, _current_on_events
 
     for w in root.winfo_children():
         w.destroy()
@@ -247,10 +274,9 @@ def build_main_app():
     bf = tk.Frame(inn, bg=_c("PANEL")); bf.pack(side="right")
 
     def _add():
-        _sm.add_sound()
-        for s in _sm.sounds.values(): init_sound_effects(s)
-        globals()["sounds"] = _sm.sounds
-        if _current_refresh: _current_refresh()
+        added = _sm.add_sound()
+        for n in added: init_sound_effects(_sm.sounds[n])
+        if added and _current_refresh: _current_refresh()
 
     def _stopall():
         _sm.stop_all_sounds()
@@ -285,6 +311,11 @@ def build_main_app():
                         font=_c("FONT_SMALL"), padx=12, pady=5)
     mon_btn.pack(side="right")
 
+    # Limiter gain-reduction meter (updated by _on_events)
+    lim_lbl = tk.Label(mch, text="", bg=_c("CARD"), fg=_c("SUBTXT"),
+                       font=_c("FONT_MONO"))
+    lim_lbl.pack(side="right", padx=(0, 12))
+
     def _toggle_mon():
         mon[0] = not mon[0]
         config["monitor_enabled"] = mon[0]
@@ -330,20 +361,21 @@ def build_main_app():
     count_lbl.pack(side="left", padx=(10, 0))
 
     # ── SCROLL CANVAS ─────────────────────────────────────────
+    # Cards are canvas windows on a fixed row pitch. Only the rows in (or
+    # near) the viewport exist as widgets; the rest are built as they
+    # scroll into view and destroyed once they scroll out.
+    CARD_GAP = 10   # space below each card
+    OVERSCAN = 2    # rows built beyond each edge of the viewport
+
     wrap = tk.Frame(root, bg=_c("BG"))
     wrap.pack(fill="both", expand=True, padx=20, pady=(0, 20))
     scrollbar = tk.Scrollbar(wrap, orient="vertical")
     canvas    = tk.Canvas(wrap, bg=_c("BG"), highlightthickness=0,
-                          yscrollcommand=scrollbar.set)
+                          yscrollcommand=lambda *a: (scrollbar.set(*a), _schedule_fill()))
     scrollbar.config(command=canvas.yview)
     scrollbar.pack(side="right", fill="y")
     canvas.pack(side="left", fill="both", expand=True)
 
-    content = tk.Frame(canvas, bg=_c("BG"))
-    win_id  = canvas.create_window((0, 0), window=content, anchor="nw")
-    canvas.bind("<Configure>", lambda e: canvas.itemconfig(win_id, width=e.width))
-    content.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-
     def _scroll(e):  canvas.yview_scroll(int(-1*(e.delta/120)), "units")
     def _scu(e):     canvas.yview_scroll(-1, "units")
     def _scd(e):     canvas.yview_scroll( 1, "units")
@@ -354,8 +386,34 @@ def build_main_app():
 
     _setup_drag_drop(canvas)
 
+    # Empty-library placeholder, shown instead of the cards
+    empty = tk.Frame(canvas, bg=_c("BG"))
+    ef = tk.Frame(empty, bg=_c("BG")); ef.pack(pady=80)
+    tk.Label(ef, text="No sounds yet",
+             bg=_c("BG"), fg=_c("SUBTXT"), font=("Segoe UI", 14)).pack()
+    tk.Label(ef, text="Drag & drop audio files here, or click  +  Add Sound",
+             bg=_c("BG"), fg=_c("SUBTXT_DARK"), font=_c("FONT_MAIN")).pack(pady=(6,0))
+    for w in (empty, ef, *ef.winfo_children()):
+        w.bind("<MouseWheel>", _scroll, add="+")
+    empty_win = canvas.create_window(0, 0, window=empty, anchor="nw", state="hidden")
+
+    def _resize(e):
+        canvas.itemconfig(empty_win, width=e.width)
+        for win, _, _ in cards.values():
+            canvas.itemconfig(win, width=e.width)
+        _layout()
+    canvas.bind("<Configure>", _resize)
+
+    order       = []   # sound names in display order
+    index       = {}   # name → row
+    cards       = {}   # name → (window id, card frame, signature) of built rows
+    row_h       = [0]  # card height + gap, grown to the tallest card built
+    fill_job    = [None]
+
     play_btns   = {}
+    play_state  = {}   # name → (playing, voices) the play button shows
     badge_rows  = {}   # name → frame holding effect badges
+    busy_lbls   = {}   # name → "rendering…" label
 
     # ─────────────────────────────────────────────────────────
     # BADGE ROW  –  shows active effects as coloured pills
@@ -379,138 +437,211 @@ def build_main_app():
                 pill.pack(side="left", padx=(0, 4))
 
     # ─────────────────────────────────────────────────────────
-    # REFRESH
+    # PLAY BUTTON STATE
+    # ─────────────────────────────────────────────────────────
+    def _paint_play(name):
+        b   = play_btns.get(name)
+        cur = _sm.sounds if _sm else sounds
+        if b is None or name not in cur: return
+        p = cur[name].get("playing", False)
+        k = cur[name].get("voices", 0) if p else 0
+        if play_state.get(name) == (p, k): return
+        play_state[name] = (p, k)
+        bg = _c("SUCCESS_GLOW") if p else _c("BTN")
+        b.config(bg=bg, fg="#fff" if p else _c("TXT"),
+                 text=(f"▶  {name}" + (f"   ×{k}" if k > 1 else "")) if p else name)
+        T.style_button(b, bg=bg, hover_bg=_c("SUCCESS") if p else _c("BTN_HOVER"))
+
+    # ─────────────────────────────────────────────────────────
+    # CARDS
+    # ─────────────────────────────────────────────────────────
+    def _card_sig(s):
+        """What a card shows that only a rebuild updates."""
+        return (s.get("hotkey"), tuple(get_active_effects(s)))
+
+    def _build_card(name, s):
+        card = tk.Frame(canvas, bg=_c("CARD"),
+                        highlightbackground=_c("BORDER"), highlightthickness=1)
+        ci = tk.Frame(card, bg=_c("CARD")); ci.pack(fill="both", padx=16, pady=12)
+
+        # Row 1: play / effects popup / editor / delete
+        r1 = tk.Frame(ci, bg=_c("CARD")); r1.pack(fill="x", pady=(0, 8))
+
+        pb = tk.Button(r1, text=name, bg=_c("BTN"), fg=_c("TXT"),
+                       font=_c("FONT_LARGE"), anchor="w",
+                       padx=20, pady=11,
+                       command=lambda n=name: (_sm.toggle_sound(n), _paint_play(n)))
+        pb.pack(side="left", fill="x", expand=True, padx=(0, 6))
+        T.style_button(pb, bg=_c("BTN"), hover_bg=_c("BTN_HOVER"))
+        play_btns[name] = pb
+        play_state.pop(name, None)
+        _paint_play(name)
+
+        # Editor button
+        ed_btn = tk.Button(r1, text="✎", bg=_c("BTN"), fg=_c("TXT"),
+                           font=("Segoe UI", 13), width=3, pady=11)
+        ed_btn.pack(side="right", padx=(4, 0))
+        ed_btn.config(command=lambda n=name: _open_editor(n))
+        T.style_button(ed_btn)
+
+        # Effects popup button
+        fx_btn = tk.Button(r1, text="✨", bg=_c("BTN"), fg=_c("TXT"),
+                           font=("Segoe UI", 13), width=3, pady=11)
+        fx_btn.pack(side="right", padx=(4, 0))
+        fx_btn.config(command=lambda n=name, b=fx_btn: _effect_popup(n, b, _rebuild_badges))
+        T.style_button(fx_btn)
+
+        # Delete
+        db = tk.Button(r1, text="×", bg=_c("DANGER_DARK"), fg="white",
+                       font=("Segoe UI", 14, "bold"), width=3, pady=11,
+                       command=lambda n=name: (_sm.remove_sound(n), refresh()))
+        db.pack(side="right")
+        T.style_button(db, bg=_c("DANGER_DARK"), hover_bg=_c("DANGER"))
+
+        # Row 2: effect badges
+        r2 = tk.Frame(ci, bg=_c("CARD")); r2.pack(fill="x", pady=(0, 8))
+        tk.Label(r2, text="Effects: ", bg=_c("CARD"), fg=_c("SUBTXT"),
+                 font=_c("FONT_SMALL")).pack(side="left")
+        badge_row = tk.Frame(r2, bg=_c("CARD")); badge_row.pack(side="left", fill="x")
+        badge_rows[name] = badge_row
+        _rebuild_badges(name)
+        busy = tk.Label(r2, text="rendering…" if is_rendering(s) else "",
+                        bg=_c("CARD"), fg=_c("ACCENT"), font=_c("FONT_SMALL"))
+        busy.pack(side="right")
+        busy_lbls[name] = busy
+
+        # Row 3: hotkey
+        r3 = tk.Frame(ci, bg=_c("CARD")); r3.pack(fill="x", pady=(0, 8))
+        tk.Label(r3, text="Hotkey:", bg=_c("CARD"), fg=_c("SUBTXT"),
+                 font=_c("FONT_SMALL")).pack(side="left")
+        hk = s.get("hotkey")
+        tk.Label(r3, text=hk or "Not set",
+                 bg=_c("BTN"), fg=_c("ACCENT") if hk else _c("SUBTXT"),
+                 font=_c("FONT_MONO"), padx=8, pady=3).pack(side="left", padx=(8, 6))
+        hkb = tk.Button(r3, text=f"⌨  {'Change' if hk else 'Set'}",
+                        bg=_c("BTN"), fg=_c("TXT"), font=_c("FONT_SMALL"),
+                        padx=8, pady=3,
+                        command=lambda n=name: _hotkey_dialog(n, refresh))
+        hkb.pack(side="left", padx=(0,4)); T.style_button(hkb)
+        if hk:
+            clr = tk.Button(r3, text="✕", bg=_c("DANGER_DARK"), fg="white",
+                            font=_c("FONT_SMALL"), padx=6, pady=3,
+                            command=lambda n=name: (_sm.remove_hotkey(n), refresh()))
+            clr.pack(side="left")
+            T.style_button(clr, bg=_c("DANGER_DARK"), hover_bg=_c("DANGER"))
+
+        # Row 4: volume
+        r4 = tk.Frame(ci, bg=_c("CARD")); r4.pack(fill="x")
+        r4h = tk.Frame(r4, bg=_c("CARD")); r4h.pack(fill="x", pady=(0,4))
+        tk.Label(r4h, text="Volume", bg=_c("CARD"), fg=_c("SUBTXT"),
+                 font=_c("FONT_SMALL")).pack(side="left")
+        vl = tk.Label(r4h, text=f"{int(s['volume']*100)}%",
+                      bg=_c("CARD"), fg=_c("ACCENT"), font=_c("FONT_MONO"))
+        vl.pack(side="right")
+        sl = tk.Scale(r4, from_=0, to=2, resolution=0.01, orient="horizontal",
+                      bg=_c("CARD"), fg=_c("TXT"), troughcolor=_c("BTN"),
+                      highlightthickness=0, showvalue=0)
+        sl.set(s["volume"])
+        def _sv(v, n=name, lbl=vl):
+            _sm.set_sound_volume(n, float(v))
+            lbl.config(text=f"{int(float(v)*100)}%")
+        sl.config(command=_sv); sl.pack(fill="x")
+
+        # Bind scroll to all card children
+        for widget in (card, ci, r1, r2, r3, r4, r4h, pb, fx_btn, ed_btn,
+                       db, hkb, sl, badge_row, vl):
+            widget.bind("<MouseWheel>", _scroll, add="+")
+            widget.bind("<Button-4>",   _scu,    add="+")
+            widget.bind("<Button-5>",   _scd,    add="+")
+        return card
+
+    def _drop_card(name):
+        win, card, _ = cards.pop(name)
+        canvas.delete(win)
+        card.destroy()
+        for d in (play_btns, play_state, badge_rows, busy_lbls):
+            d.pop(name, None)
+
+    def _place_cards(rows):
+        """Build the cards for rows and put them on the canvas."""
+        cur = _sm.sounds if _sm else sounds
+        new = [(i, _build_card(order[i], cur[order[i]])) for i in rows]
+        if not new: return
+        canvas.update_idletasks()   # one geometry pass for the whole batch
+        tallest = max(card.winfo_reqheight() for _, card in new) + CARD_GAP
+        if tallest > row_h[0]:
+            row_h[0] = tallest
+            _layout()
+        w = canvas.winfo_width()
+        for i, card in new:
+            n = order[i]
+            win = canvas.create_window(0, i * row_h[0], window=card, anchor="nw",
+                                       width=w, height=row_h[0] - CARD_GAP)
+            cards[n] = (win, card, _card_sig(cur[n]))
+
+    def _layout():
+        """Move built cards to their rows and size the scroll region."""
+        rh = row_h[0]
+        for n, (win, _, _) in cards.items():
+            canvas.coords(win, 0, index[n] * rh)
+            canvas.itemconfig(win, height=rh - CARD_GAP)
+        canvas.configure(scrollregion=(0, 0, canvas.winfo_width(), len(order) * rh))
+
+    def _fill():
+        """Build the rows in view and destroy the ones that scrolled away."""
+        fill_job[0] = None
+        if not root.winfo_exists() or not order: return
+        if not row_h[0]:
+            _place_cards([0])   # measures the row pitch
+        rh    = row_h[0]
+        top   = canvas.canvasy(0)
+        first = max(0, int(top // rh) - OVERSCAN)
+        last  = min(len(order), int((top + canvas.winfo_height()) // rh) + 1 + OVERSCAN)
+        keep  = set(order[first:last])
+        for n in [n for n in cards if n not in keep]:
+            _drop_card(n)
+        _place_cards([i for i in range(first, last) if order[i] not in cards])
+
+    def _schedule_fill():
+        if fill_job[0] is None:
+            fill_job[0] = root.after_idle(_fill)
+
+    # ─────────────────────────────────────────────────────────
+    # REFRESH  –  rebuilds only cards that were added, removed or changed
     # ─────────────────────────────────────────────────────────
     def refresh():
-        for w in content.winfo_children(): w.destroy()
-        play_btns.clear(); badge_rows.clear()
         cur = _sm.sounds if _sm else sounds
         count_lbl.config(text=f"{len(cur)} loaded")
-
-        if not cur:
-            ef = tk.Frame(content, bg=_c("BG")); ef.pack(pady=80)
-            tk.Label(ef, text="No sounds yet",
-                     bg=_c("BG"), fg=_c("SUBTXT"), font=("Segoe UI", 14)).pack()
-            tk.Label(ef, text="Drag & drop audio files here, or click  +  Add Sound",
-                     bg=_c("BG"), fg=_c("SUBTXT_DARK"), font=_c("FONT_MAIN")).pack(pady=(6,0))
-            for w in (ef, *ef.winfo_children()):
-                w.bind("<MouseWheel>", _scroll, add="+")
-            return
-
-        for name, s in cur.items():
+        for s in cur.values():
             init_sound_effects(s)
-            playing = s.get("playing", False)
-
-            card = tk.Frame(content, bg=_c("CARD"),
-                            highlightbackground=_c("BORDER"), highlightthickness=1)
-            card.pack(fill="x", pady=(0, 10))
-            ci = tk.Frame(card, bg=_c("CARD")); ci.pack(fill="both", padx=16, pady=12)
-
-            # Row 1: play / effects popup / editor / delete
-            r1 = tk.Frame(ci, bg=_c("CARD")); r1.pack(fill="x", pady=(0, 8))
-
-            pb = tk.Button(r1,
-                           text=f"▶  {name}" if playing else name,
-                           bg=_c("SUCCESS_GLOW") if playing else _c("BTN"),
-                           fg="#fff" if playing else _c("TXT"),
-                           font=_c("FONT_LARGE"), anchor="w",
-                           padx=20, pady=11,
-                           command=lambda n=name: (_sm.toggle_sound(n), refresh()))
-            pb.pack(side="left", fill="x", expand=True, padx=(0, 6))
-            T.style_button(pb,
-                           bg=_c("SUCCESS_GLOW") if playing else _c("BTN"),
-                           hover_bg=_c("SUCCESS") if playing else _c("BTN_HOVER"))
-            play_btns[name] = pb
-
-            # Editor button
-            ed_btn = tk.Button(r1, text="✎", bg=_c("BTN"), fg=_c("TXT"),
-                               font=("Segoe UI", 13), width=3, pady=11)
-            ed_btn.pack(side="right", padx=(4, 0))
-            ed_btn.config(command=lambda n=name: _open_editor(n))
-            T.style_button(ed_btn)
-
-            # Effects popup button
-            fx_btn = tk.Button(r1, text="✨", bg=_c("BTN"), fg=_c("TXT"),
-                               font=("Segoe UI", 13), width=3, pady=11)
-            fx_btn.pack(side="right", padx=(4, 0))
-            fx_btn.config(command=lambda n=name, b=fx_btn: _effect_popup(n, b, _rebuild_badges))
-            T.style_button(fx_btn)
-
-            # Delete
-            db = tk.Button(r1, text="×", bg=_c("DANGER_DARK"), fg="white",
-                           font=("Segoe UI", 14, "bold"), width=3, pady=11,
-                           command=lambda n=name: (_sm.remove_sound(n), refresh()))
-            db.pack(side="right")
-            T.style_button(db, bg=_c("DANGER_DARK"), hover_bg=_c("DANGER"))
-
-            # Row 2: effect badges
-            r2 = tk.Frame(ci, bg=_c("CARD")); r2.pack(fill="x", pady=(0, 8))
-            tk.Label(r2, text="Effects: ", bg=_c("CARD"), fg=_c("SUBTXT"),
-                     font=_c("FONT_SMALL")).pack(side="left")
-            badge_row = tk.Frame(r2, bg=_c("CARD")); badge_row.pack(side="left", fill="x")
-            badge_rows[name] = badge_row
-            _rebuild_badges(name)
 
-            # Row 3: hotkey
-            r3 = tk.Frame(ci, bg=_c("CARD")); r3.pack(fill="x", pady=(0, 8))
-            tk.Label(r3, text="Hotkey:", bg=_c("CARD"), fg=_c("SUBTXT"),
-                     font=_c("FONT_SMALL")).pack(side="left")
-            hk = s.get("hotkey")
-            tk.Label(r3, text=hk or "Not set",
-                     bg=_c("BTN"), fg=_c("ACCENT") if hk else _c("SUBTXT"),
-                     font=_c("FONT_MONO"), padx=8, pady=3).pack(side="left", padx=(8, 6))
-            hkb = tk.Button(r3, text=f"⌨  {'Change' if hk else 'Set'}",
-                            bg=_c("BTN"), fg=_c("TXT"), font=_c("FONT_SMALL"),
-                            padx=8, pady=3,
-                            command=lambda n=name: _hotkey_dialog(n, refresh))
-            hkb.pack(side="left", padx=(0,4)); T.style_button(hkb)
-            if hk:
-                clr = tk.Button(r3, text="✕", bg=_c("DANGER_DARK"), fg="white",
-                                font=_c("FONT_SMALL"), padx=6, pady=3,
-                                command=lambda n=name: (_sm.remove_hotkey(n), refresh()))
-                clr.pack(side="left")
-                T.style_button(clr, bg=_c("DANGER_DARK"), hover_bg=_c("DANGER"))
-
-            # Row 4: volume
-            r4 = tk.Frame(ci, bg=_c("CARD")); r4.pack(fill="x")
-            r4h = tk.Frame(r4, bg=_c("CARD")); r4h.pack(fill="x", pady=(0,4))
-            tk.Label(r4h, text="Volume", bg=_c("CARD"), fg=_c("SUBTXT"),
-                     font=_c("FONT_SMALL")).pack(side="left")
-            vl = tk.Label(r4h, text=f"{int(s['volume']*100)}%",
-                          bg=_c("CARD"), fg=_c("ACCENT"), font=_c("FONT_MONO"))
-            vl.pack(side="right")
-            sl = tk.Scale(r4, from_=0, to=2, resolution=0.01, orient="horizontal",
-                          bg=_c("CARD"), fg=_c("TXT"), troughcolor=_c("BTN"),
-                          highlightthickness=0, showvalue=0)
-            sl.set(s["volume"])
-            def _sv(v, n=name, lbl=vl):
-                _sm.set_sound_volume(n, float(v))
-                lbl.config(text=f"{int(float(v)*100)}%")
-            sl.config(command=_sv); sl.pack(fill="x")
-
-            # Bind scroll to all card children
-            for widget in (card, ci, r1, r2, r3, r4, r4h, pb, fx_btn, ed_btn,
-                           db, hkb, sl, badge_row, vl):
-                widget.bind("<MouseWheel>", _scroll, add="+")
-                widget.bind("<Button-4>",   _scu,    add="+")
-                widget.bind("<Button-5>",   _scd,    add="+")
-
-        canvas.update_idletasks()
-        canvas.configure(scrollregion=canvas.bbox("all"))
-
-    # Live play-state update
-    def _live():
+        for n in [n for n, c in cards.items()
+                  if n not in cur or c[2] != _card_sig(cur[n])]:
+            _drop_card(n)
+        order[:] = cur
+        index.clear()
+        index.update((n, i) for i, n in enumerate(order))
+
+        canvas.itemconfig(empty_win, state="hidden" if cur else "normal")
+        _layout()
+        _fill()
+
+    # Live state from engine events: repaint only the cards they touch
+    def _paint_limiter():
+        lim = _ae.get_limiter_stats() if _ae else None
+        lim_lbl.config(text=f"Limiter  −{lim['cable_gr_db']:4.1f} dB" if lim else "",
+                       fg=_c("DANGER") if lim and lim["cable_gr_db"] >= 6.0 else _c("SUBTXT"))
+
+    def _on_events(batch):
         if not root.winfo_exists(): return
         cur = _sm.sounds if _sm else sounds
-        for n, b in play_btns.items():
-            if n not in cur: continue
-            p = cur[n].get("playing", False)
-            want_bg  = _c("SUCCESS_GLOW") if p else _c("BTN")
-            want_txt = f"▶  {n}" if p else n
-            want_fg  = "#fff" if p else _c("TXT")
-            if b["bg"] != want_bg:
-                b.config(bg=want_bg, text=want_txt, fg=want_fg)
-        root.after(100, _live)
+        if any(ev == "limiter" for ev, _ in batch):
+            _paint_limiter()
+        touched = {id(s) for _, s in batch if s is not None}
+        for n in play_btns:
+            if id(cur.get(n)) in touched:
+                _paint_play(n)
+                busy_lbls[n].config(text="rendering…" if is_rendering(cur[n]) else "")
 
     def _open_editor(name):
         from ui.sound_editor import open_editor
@@ -520,9 +651,10 @@ def build_main_app():
             _rebuild_badges(name)
         ))
 
-    _current_refresh = refresh
+    _current_refresh   = refresh
+    _current_on_events = _on_events
     refresh()
-    _live()
+    _paint_limiter()
 
     if not config.get("mic_out"):
         root.after(600, lambda: (
@@ -535,62 +667,69 @@ def build_main_app():
 # ─────────────────────────────────────────────────────────────
 # STARTUP
 # ─────────────────────────────────────────────────────────────
-try:
-    config = load_config()
-    T.set_theme(config.get("theme", "dark"))
+# Guarded so sound_manager's decode worker processes (spawned, not forked,
+# on Windows) don't open a second window when they re-import this module.
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
 
-    root = tk.Tk()
-    root.title(f"Soundboard Pro  v{__version__}")
-    root.geometry("760x900")
-    root.configure(bg=_c("BG"))
-    root.minsize(600, 500)
-
-    # Show splash immediately, load heavy stuff right after
-    lf = tk.Frame(root, bg=_c("BG")); lf.pack(expand=True, fill="both")
-    tk.Label(lf, text="SOUNDBOARD PRO", bg=_c("BG"), fg=_c("ACCENT"),
-             font=("Segoe UI", 26, "bold")).pack(pady=(260, 10))
-    status = tk.Label(lf, text="Loading…", bg=_c("BG"), fg=_c("SUBTXT"),
-                      font=_c("FONT_MAIN"))
-    status.pack()
-    root.update()
-
-    def _startup():
-        try:
-            status.config(text="Loading audio libraries…"); root.update()
-            _load_modules()
-            status.config(text="Initialising audio…");     root.update()
-            _init_audio()
-            status.config(text="Building interface…");      root.update()
-            build_main_app()
+    try:
+        config = load_config()
+        T.set_theme(config.get("theme", "dark"))
+
+        root = tk.Tk()
+        root.title(f"Soundboard Pro  v{__version__}")
+        root.geometry("760x900")
+        root.configure(bg=_c("BG"))
+        root.minsize(600, 500)
+
+        # Show splash immediately, load heavy stuff right after
+        lf = tk.Frame(root, bg=_c("BG")); lf.pack(expand=True, fill="both")
+        tk.Label(lf, text="SOUNDBOARD PRO", bg=_c("BG"), fg=_c("ACCENT"),
+                 font=("Segoe UI", 26, "bold")).pack(pady=(260, 10))
+        status = tk.Label(lf, text="Loading…", bg=_c("BG"), fg=_c("SUBTXT"),
+                          font=_c("FONT_MAIN"))
+        status.pack()
+        root.update()
+
+        def _startup():
+            try:
+                status.config(text="Loading audio libraries…"); root.update()
+                _load_modules()
+                status.config(text="Initialising audio…");     root.update()
+                _init_audio()
+                status.config(text="Building interface…");      root.update()
+                build_main_app()
+                if _ae: _start_event_pump()
+                try:
+                    from updater import check_updates_in_background
+                    check_updates_in_background(root)
+                except Exception: pass
+            except Exception:
+                traceback.print_exc()
+                messagebox.showerror("Startup Error",
+                                     "Soundboard Pro failed to start.\nSee console for details.")
+
+        root.after(80, _startup)
+
+        def _on_close():
+            save_config(config)
+            flush_config()
             try:
-                from updater import check_updates_in_background
-                check_updates_in_background(root)
+                import keyboard; keyboard.unhook_all()
             except Exception: pass
-        except Exception:
-            traceback.print_exc()
-            messagebox.showerror("Startup Error",
-                                 "Soundboard Pro failed to start.\nSee console for details.")
+            if _ae:
+                try: _ae.stop()
+                except Exception: pass
+            root.destroy()
 
-    root.after(80, _startup)
+        root.protocol("WM_DELETE_WINDOW", _on_close)
+        root.mainloop()
 
-    def _on_close():
-        save_config(config)
+    except Exception:
+        traceback.print_exc()
         try:
-            import keyboard; keyboard.unhook_all()
+            _r = tk.Tk(); _r.withdraw()
+            messagebox.showerror("Fatal Error",
+                                 "Soundboard Pro could not start.\nCheck the console.")
+            _r.destroy()
         except Exception: pass
-        if _ae:
-            try: _ae.stop()
-            except Exception: pass
-        root.destroy()
-
-    root.protocol("WM_DELETE_WINDOW", _on_close)
-    root.mainloop()
-
-except Exception:
-    traceback.print_exc()
-    try:
-        _r = tk.Tk(); _r.withdraw()
-        messagebox.showerror("Fatal Error",
-                             "Soundboard Pro could not start.\nCheck the console.")
-        _r.destroy()
-    except Exception: pass
@@ -1,21 +1,95 @@
 # audio_engine.py
 import sounddevice as sd
 import numpy as np
+import collections
+import queue
 import threading
+import time
 
-BLOCK = 1024
+from ringbuffer import RingBuffer
+from limiter import Limiter
+from effects import render_voice
+
+BLOCK = 1024                                 # current block size (config "block_size")
+BLOCK_SIZES = (128, 256, 512, 1024, 2048)    # fallback ladder, smallest first
+XRUN_LIMIT  = 3                              # underruns per second before falling back
+
+_requested_block = BLOCK
+_xruns = 0                      # output underflows + input overflows seen
+_generation = 0                 # bumped by start/stop to retire the watchdog
+_state_lock = threading.RLock() # serialises start/stop with the watchdog
 
 config  = {}
 sounds  = {}
-_lock   = threading.Lock()
+
+# Commands from the UI / hotkey threads to the audio callback, as
+# (op, sound, arg) tuples. deque.append and deque.popleft are atomic, so
+# producers never block the callback and the callback never waits on a
+# lock held by UI code; it drains the queue at the start of every block.
+_commands = collections.deque()
+
+# Notifications the other way, to the UI, as (event, sound) tuples:
+#   "start" / "stop"  a voice of sound started / ended
+#   "render"          sound's "rendering" flag changed (see effects)
+#   "limiter"         the cable limiter's displayed gain reduction changed
+# SimpleQueue.put never blocks, so the callback can publish; the UI waits
+# on the queue instead of polling, and does nothing while the board is idle.
+_events = queue.SimpleQueue()
+
+# ─────────────────────────────────────────────────────────────
+# Voice pool
+# ─────────────────────────────────────────────────────────────
+# Playback state lives on voices, not on sounds, so one sound can play
+# several times at once (rapid-fire retriggers). The pool is allocated
+# when streams open (config "max_voices") and never grows; a trigger with
+# no free voice steals the oldest one. Voices, _active and each sound's
+# "voices" / "playing" fields are only written by the audio callback (or
+# directly while no stream is running).
+
+DEFAULT_VOICES = 16
+
+
+class _Voice:
+    __slots__ = ("sound", "data", "pos", "gain", "serial")
+
+    def __init__(self):
+        self.sound  = None   # sound dict, None while free
+        self.data   = None   # buffer being played (the sound's "data")
+        self.pos    = 0.0    # source position
+        self.gain   = 1.0    # per-trigger gain, times the sound's volume
+        self.serial = 0      # trigger order, for stealing the oldest
+
+
+_voices = [_Voice() for _ in range(DEFAULT_VOICES)]
+_free   = list(_voices)   # stack of idle voices
+_active = []              # playing voices, oldest first
+_serial = 0
 
 _mic_stream     = None
 _vmic_stream    = None
 _monitor_stream = None
 _monitor_enabled = True
 
-_mic_buf      = np.zeros(BLOCK, dtype="float32")
-_mic_buf_lock = threading.Lock()
+# Mic samples travel from the input callback to the virtual-cable callback
+# through a jitter buffer, so the two streams can run at different times
+# and with different block sizes without dropping or repeating audio.
+_mic_ring = None
+
+# Headphone mix from the virtual-cable callback to the monitor callback
+_monitor_ring = None
+
+# Look-ahead limiters on the two output buses (state carries across blocks)
+_cable_lim   = Limiter(48000)
+_monitor_lim = Limiter(48000)
+_lim_shown   = 0.0   # cable gain reduction (0.1 dB steps) last sent to the UI
+_lim_frames  = 0     # frames mixed since then
+
+# Scratch buffers for the mixer callback. Allocated once (and only grown
+# if the driver ever hands us a bigger block) so the real-time thread does
+# no array allocation in steady state – every numpy op below uses out=.
+_mix_buf = np.zeros(BLOCK, dtype="float32")   # sum of all playing sounds
+_tmp_buf = np.zeros(BLOCK, dtype="float32")   # per-sound gain / mic signal
+_hp_buf  = np.zeros(BLOCK, dtype="float32")   # headphone monitor output
 
 SR = 48000
 
@@ -31,124 +105,458 @@ def set_monitor_enabled(enabled: bool):
     _monitor_enabled = enabled
 
 
-def start():
-    global _mic_stream, _vmic_stream, _monitor_stream, SR
+def _running():
+    try:
+        return _vmic_stream is not None and _vmic_stream.active
+    except Exception:
+        return False
 
-    stop()
 
-    vmic_dev    = config.get("mic_out")
-    mic_dev     = config.get("mic")
-    monitor_dev = config.get("monitor_out")
+def _post(op, s=None, arg=None):
+    cmd = (op, s, arg)
+    if _running():
+        _commands.append(cmd)
+    else:
+        _apply(cmd)
+
+
+def start_voice(s, gain=1.0):
+    """Start another voice of s from the beginning; voices already
+    playing s carry on (overlapping retrigger)."""
+    _post("start", s, float(gain))
+
+
+def restart_voice(s):
+    """Stop every voice of s and start one from the beginning."""
+    _post("restart", s, 1.0)
+
+
+def stop_voice(s):
+    """Stop every voice of s."""
+    _post("stop", s)
+
+
+def toggle_voice(s):
+    """Start s if it is stopped, stop it if it is playing."""
+    _post("toggle", s, 1.0)
 
-    if vmic_dev is None:
-        print("[audio] mic_out not set – skipping")
-        return
 
-    # Detect SR from device
+def stop_all_voices():
+    _post("stop_all")
+
+
+def set_volume(s, volume):
+    _post("volume", s, float(volume))
+
+
+def swap_buffer(s, data, plan, shift=None):
+    """Publish a new render of s: its "data" and "_plan" are installed
+    together, between two blocks. Its voices carry on from the same point
+    in the new buffer (their positions move back by shift samples), or
+    restart on it if shift is None."""
+    _post("swap", s, (data, plan, shift))
+
+
+def post_event(ev, s=None):
+    """Queue an (event, sound) notification for the UI. Never blocks."""
+    _events.put((ev, s))
+
+
+def wait_event(timeout=None):
+    """Block until an event is queued and return it (None on timeout)."""
     try:
-        SR = int(sd.query_devices(vmic_dev)["default_samplerate"])
-        print(f"[audio] device SR = {SR}")
-    except Exception as e:
-        print(f"[audio] SR detection failed: {e}, using {SR}")
+        return _events.get(timeout=timeout)
+    except queue.Empty:
+        return None
+
+
+def _ensure_voices(n):
+    """Resize the pool to n voices. Only call while no stream is running."""
+    global _voices, _free
+    n = max(1, int(n))
+    if n == len(_voices):
+        return
+    _stop_all()
+    _voices = [_Voice() for _ in range(n)]
+    _free   = list(_voices)
+
+
+def _release(v, i):
+    """Free _active[i] (which is v)."""
+    s = v.sound
+    n = s.get("voices", 1) - 1
+    s["voices"]  = n
+    s["playing"] = n > 0
+    v.sound = v.data = None
+    del _active[i]
+    _free.append(v)
+    _events.put(("stop", s))
+
+
+def _start(s, gain):
+    global _serial
+    if _free:
+        v = _free.pop()
+    else:
+        # Pool exhausted: steal the oldest voice
+        v = _active[0]
+        _release(v, 0)
+        _free.pop()
+    _serial += 1
+    v.sound, v.data, v.pos, v.gain, v.serial = s, s["data"], 0.0, gain, _serial
+    _active.append(v)
+    s["voices"]  = s.get("voices", 0) + 1
+    s["playing"] = True
+    _events.put(("start", s))
+
+
+def _stop(s):
+    i = len(_active) - 1
+    while i >= 0:
+        v = _active[i]
+        if v.sound is s:
+            _release(v, i)
+        i -= 1
+
+
+def _stop_all():
+    while _active:
+        _release(_active[-1], len(_active) - 1)
+
+
+def _apply(cmd):
+    op, s, arg = cmd
+    if op == "start":
+        _start(s, arg)
+    elif op == "toggle":
+        if s.get("playing", False):
+            _stop(s)
+        else:
+            _start(s, arg)
+    elif op == "restart":
+        _stop(s)
+        _start(s, arg)
+    elif op == "stop":
+        _stop(s)
+    elif op == "stop_all":
+        _stop_all()
+    elif op == "volume":
+        s["volume"] = arg
+    elif op == "swap":
+        data, plan, shift = arg
+        s["data"]  = data
+        s["_plan"] = plan
+        for v in _active:
+            # A voice already on data started after the render was made
+            if v.sound is s and v.data is not data:
+                v.data = data
+                v.pos  = 0.0 if shift is None else max(0.0, v.pos - shift)
+
+
+def _drain():
+    while _commands:
+        _apply(_commands.popleft())
+
+
+def _ensure_scratch(frames):
+    global _mix_buf, _tmp_buf, _hp_buf
+    if len(_mix_buf) < frames:
+        _mix_buf = np.zeros(frames, dtype="float32")
+        _tmp_buf = np.zeros(frames, dtype="float32")
+        _hp_buf  = np.zeros(frames, dtype="float32")
+
 
-    # Reload sounds at correct SR
+def _ring_stats(ring, *streams):
+    """Jitter-buffer depth, xrun counters and end-to-end latency in ms."""
+    ring_ms = ring.avg_fill / SR * 1000.0
     try:
-        import sound_manager as _sm
-        _sm.set_target_sr(SR)
-        _sm.load_sounds()
-        from effects import init_sound_effects
-        for s in _sm.sounds.values():
-            init_sound_effects(s)
-        print(f"[audio] {len(_sm.sounds)} sounds loaded at {SR} Hz")
-    except Exception as e:
-        print(f"[audio] sound reload failed: {e}")
+        device_ms = sum(st.latency for st in streams) * 1000.0
+    except Exception:
+        device_ms = 0.0
+    return {
+        "target_ms":  ring.target / SR * 1000.0,
+        "buffer_ms":  ring_ms,
+        "underruns":  ring.underruns,
+        "overruns":   ring.overruns,
+        "latency_ms": device_ms + ring_ms,
+    }
+
+
+def get_mic_stats():
+    """Mic → virtual cable path stats (see _ring_stats). None while the
+    mic isn't running."""
+    if _mic_ring is None or _mic_stream is None or _vmic_stream is None:
+        return None
+    return _ring_stats(_mic_ring, _mic_stream, _vmic_stream)
+
+
+def get_monitor_stats():
+    """Mixer → headphone path stats (see _ring_stats). None while the
+    monitor isn't running."""
+    if _monitor_ring is None or _monitor_stream is None or _vmic_stream is None:
+        return None
+    return _ring_stats(_monitor_ring, _monitor_stream)
+
+
+# Mic input
+def _mic_cb(indata, frames, time_info, status):
+    global _xruns
+    if status and status.input_overflow:
+        _xruns += 1
+    _mic_ring.write(indata[:frames, 0])
+
+
+# Headphone monitor – runs on its own device clock, fed by _vmic_cb
+def _monitor_cb(outdata, frames, time_info, status):
+    _monitor_ring.read_resampled(outdata[:frames, 0])
+
+
+# Virtual cable output — single callback, advances pos ONCE, feeds the monitor too
+def _vmic_cb(outdata, frames, time_info, status):
+    global _xruns
+    if status and status.output_underflow:
+        _xruns += 1
+    _ensure_scratch(frames)
+    mix = _mix_buf[:frames]
+    tmp = _tmp_buf[:frames]
+
+    _drain()
+
+    # Mix voices — positions advance here only
+    mix.fill(0.0)
+    i = 0
+    while i < len(_active):
+        v   = _active[i]
+        s   = v.sound
+        pos = render_voice(s, v.data, v.pos, tmp)
+        np.multiply(tmp, v.gain * float(s.get("volume", 1.0)), out=tmp)
+        np.add(mix, tmp, out=mix)
+        if pos < 0:
+            _release(v, i)
+        else:
+            v.pos = pos
+            i += 1
+
+    # Mic signal for the virtual cable
+    if _mic_stream is not None:
+        _mic_ring.read(tmp)
+        np.multiply(tmp, float(config.get("mic_volume", 1.0)), out=tmp)
+    else:
+        tmp.fill(0.0)
+
+    # Queue the headphone mix; _monitor_cb plays it out on the monitor
+    # device's own clock, so a stalled headphone device can't block us
+    if _monitor_stream is not None:
+        hp = _hp_buf[:frames]
+        if _monitor_enabled:
+            np.add(mix, tmp, out=hp)
+        else:
+            np.copyto(hp, mix)
+        np.multiply(hp, float(config.get("headphone_volume", 1.0)), out=hp)
+        _monitor_lim.process(hp)
+        _monitor_ring.write(hp)
+
+    out = outdata[:frames, 0]
+    np.add(mix, tmp, out=out)
+    _cable_lim.process(out)
+    _publish_limiter(frames)
+
+
+def _publish_limiter(frames):
+    """Post a "limiter" event when the meter reading changes, at most
+    about ten times a second."""
+    global _lim_shown, _lim_frames
+    _lim_frames += frames
+    if _lim_frames < SR // 10:
+        return
+    gr = round(_cable_lim.gr_db, 1)
+    if gr != _lim_shown:
+        _lim_shown  = gr
+        _lim_frames = 0
+        _events.put(("limiter", None))
+
+
+def get_limiter_stats():
+    """Current gain reduction (dB, 0 = not limiting) on each output bus,
+    or None while the virtual cable isn't running."""
+    if _vmic_stream is None:
+        return None
+    return {
+        "cable_gr_db":   _cable_lim.gr_db,
+        "monitor_gr_db": _monitor_lim.gr_db if _monitor_stream is not None else None,
+    }
+
+
+def get_latency_info():
+    """Block size and the latencies (ms) reported by the open streams, or
+    None while the virtual cable isn't running."""
+    if _vmic_stream is None:
+        return None
+    def _ms(st):
+        try:
+            return st.latency * 1000.0 if st is not None else None
+        except Exception:
+            return None
+    mic = get_mic_stats()
+    return {
+        "block":           BLOCK,
+        "requested_block": _requested_block,
+        "block_ms":        BLOCK / SR * 1000.0,
+        "output_ms":       _ms(_vmic_stream),
+        "input_ms":        _ms(_mic_stream),
+        "monitor_ms":      _ms(_monitor_stream),
+        "mic_to_cable_ms": mic["latency_ms"] if mic else None,
+        "limiter_ms":      _cable_lim.lookahead / SR * 1000.0,
+        "xruns":           _xruns,
+    }
+
+
+def _open_streams(block):
+    """Open monitor, mic and virtual cable with the given block size.
+    Returns False if the virtual cable could not be started."""
+    global _mic_stream, _vmic_stream, _monitor_stream, _mic_ring, _monitor_ring, BLOCK
+    global _cable_lim, _monitor_lim
+
+    BLOCK = block
+    _ensure_scratch(BLOCK)
+    _ensure_voices(config.get("max_voices", DEFAULT_VOICES))
+    _cable_lim   = Limiter(SR)
+    _monitor_lim = Limiter(SR)
+    latency     = config.get("latency", "high")
+    vmic_dev    = config.get("mic_out")
+    mic_dev     = config.get("mic")
+    monitor_dev = config.get("monitor_out")
 
-    # Open monitor as a raw stream we write to manually (not callback-based)
-    # This way it is driven by the vmic callback — one clock, no drift.
+    # Monitor is a callback stream reading from a ring buffer the mixer
+    # fills. The two devices keep independent clocks; read_resampled
+    # absorbs the drift between them.
     if monitor_dev is not None:
+        target = int(float(config.get("monitor_buffer_ms", 30)) * SR / 1000)
+        _monitor_ring = RingBuffer(max(8 * BLOCK, 4 * target), target)
         try:
-            _monitor_stream = sd.RawOutputStream(
-                samplerate=SR, blocksize=BLOCK,
+            _monitor_stream = sd.OutputStream(
+                samplerate=SR, blocksize=BLOCK, latency=latency,
                 channels=1, dtype="float32",
-                device=monitor_dev)
+                device=monitor_dev, callback=_monitor_cb)
             _monitor_stream.start()
-            print(f"[audio] monitor started (device {monitor_dev})")
+            print(f"[audio] monitor started (device {monitor_dev}), "
+                  f"buffer target {target / SR * 1000:.1f} ms")
         except Exception as e:
             print(f"[audio] monitor failed: {e}")
             _monitor_stream = None
 
-    # Mic input
-    def _mic_cb(indata, frames, time_info, status):
-        with _mic_buf_lock:
-            _mic_buf[:frames] = indata[:frames, 0]
-
     if mic_dev is not None:
+        target = int(float(config.get("mic_buffer_ms", 20)) * SR / 1000)
+        _mic_ring = RingBuffer(max(8 * BLOCK, 4 * target), target)
         try:
             _mic_stream = sd.InputStream(
-                samplerate=SR, blocksize=BLOCK,
+                samplerate=SR, blocksize=BLOCK, latency=latency,
                 channels=1, dtype="float32",
                 device=mic_dev, callback=_mic_cb)
             _mic_stream.start()
-            print(f"[audio] mic started (device {mic_dev})")
+            print(f"[audio] mic started (device {mic_dev}), "
+                  f"buffer target {target / SR * 1000:.1f} ms")
         except Exception as e:
             print(f"[audio] mic failed: {e}")
-
-    # Virtual cable output — single callback, advances pos ONCE, writes to monitor too
-    def _vmic_cb(outdata, frames, time_info, status):
-        # Mix sounds — pos advances here only
-        sound_mix = np.zeros(frames, dtype="float32")
-        with _lock:
-            for s in sounds.values():
-                if not s.get("playing", False):
-                    continue
-                pos  = s["pos"]
-                data = s["data"]
-                chunk = data[pos: pos + frames]
-                if len(chunk) < frames:
-                    chunk = np.pad(chunk, (0, frames - len(chunk)))
-                    s["playing"] = False
-                    s["pos"]     = 0
-                else:
-                    s["pos"] = pos + frames
-                sound_mix += chunk * float(s.get("volume", 1.0))
-
-        # Add mic to virtual cable
-        mic_vol = float(config.get("mic_volume", 1.0))
-        with _mic_buf_lock:
-            mic = _mic_buf[:frames] * mic_vol
-
-        vmic_out = np.clip(sound_mix + mic, -1.0, 1.0)
-        outdata[:, 0] = vmic_out
-
-        # Write to headphones from the same callback — same clock, no drift
-        if _monitor_stream is not None:
-            hp_vol = float(config.get("headphone_volume", 1.0))
-            if _monitor_enabled:
-                hp_out = np.clip((sound_mix + mic) * hp_vol, -1.0, 1.0)
-            else:
-                hp_out = np.clip(sound_mix * hp_vol, -1.0, 1.0)
-            try:
-                _monitor_stream.write(hp_out.astype("float32").tobytes())
-            except Exception:
-                pass
+            _mic_stream = None
 
     try:
         _vmic_stream = sd.OutputStream(
-            samplerate=SR, blocksize=BLOCK,
+            samplerate=SR, blocksize=BLOCK, latency=latency,
             channels=1, dtype="float32",
             device=vmic_dev, callback=_vmic_cb)
         _vmic_stream.start()
-        print(f"[audio] virtual cable started (device {vmic_dev})")
     except Exception as e:
-        print(f"[audio] virtual cable failed: {e}")
-        return
+        print(f"[audio] virtual cable failed at block {BLOCK}: {e}")
+        _close_streams()
+        return False
 
+    info = get_latency_info()
+    print(f"[audio] virtual cable started (device {vmic_dev}), block {BLOCK} "
+          f"({info['block_ms']:.1f} ms), output latency {info['output_ms'] or 0:.1f} ms")
+    return True
 
-def stop():
+
+def _open_with_fallback(block):
+    """Open the streams at block, or the next bigger size that works."""
+    for size in [block] + [b for b in BLOCK_SIZES if b > block]:
+        if _open_streams(size):
+            if size != block:
+                print(f"[audio] block {block} not supported – using {size}")
+            return True
+    return False
+
+
+def _close_streams():
     global _mic_stream, _vmic_stream, _monitor_stream
     for s in (_mic_stream, _vmic_stream, _monitor_stream):
         if s:
             try: s.stop(); s.close()
             except Exception: pass
     _mic_stream = _vmic_stream = _monitor_stream = None
+    _drain()   # nothing consumes the queue now – apply what is left
+
+
+def _watchdog(gen):
+    """Fall back to the next bigger block if the device keeps underrunning."""
+    last = _xruns
+    while True:
+        time.sleep(1.0)
+        with _state_lock:
+            if gen != _generation:
+                return
+            bad, last = _xruns - last, _xruns
+            if bad < XRUN_LIMIT or BLOCK >= BLOCK_SIZES[-1]:
+                continue
+            print(f"[audio] {bad} xruns/s at block {BLOCK} – falling back")
+            block = BLOCK
+            _close_streams()
+            _open_with_fallback(block * 2)
+            last = _xruns
+
+
+def start():
+    global SR, _requested_block, _generation
+
+    with _state_lock:
+        stop()
+
+        vmic_dev = config.get("mic_out")
+        if vmic_dev is None:
+            print("[audio] mic_out not set – skipping")
+            return
+
+        # Detect SR from device
+        try:
+            SR = int(sd.query_devices(vmic_dev)["default_samplerate"])
+            print(f"[audio] device SR = {SR}")
+        except Exception as e:
+            print(f"[audio] SR detection failed: {e}, using {SR}")
+
+        # Reload sounds at correct SR
+        try:
+            import sound_manager as _sm
+            _sm.set_target_sr(SR)
+            _sm.load_sounds()
+            from effects import init_sound_effects
+            for s in _sm.sounds.values():
+                init_sound_effects(s)
+            print(f"[audio] {len(_sm.sounds)} sounds loaded at {SR} Hz")
+        except Exception as e:
+            print(f"[audio] sound reload failed: {e}")
+
+        _requested_block = int(config.get("block_size", 1024))
+        if _open_with_fallback(_requested_block):
+            _generation += 1
+            threading.Thread(target=_watchdog, args=(_generation,),
+                             daemon=True).start()
+            post_event("limiter")   # meter appears
+
+
+def stop():
+    global _generation
+    with _state_lock:
+        _generation += 1   # retires the watchdog
+        _close_streams()
+    post_event("limiter")   # meter goes away
     print("[audio] stopped")
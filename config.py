@@ -1,5 +1,8 @@
+import atexit
 import json
 import os
+import threading
+import time
 
 # Save config in user's AppData folder, not the install directory
 # This works even when installed in Program Files
@@ -25,6 +28,16 @@ DEFAULT_CONFIG = {
     "mic_volume": 1.0,
     "headphone_volume": 1.0,
     "monitor_enabled": True,  # Hear yourself by default
+    "block_size": 1024,       # Frames per audio callback (smaller = less delay)
+    "latency": "high",        # sounddevice latency hint: "low" or "high"
+    "mic_buffer_ms": 20,      # Mic jitter-buffer target between input and output
+    "monitor_buffer_ms": 30,  # Headphone buffer target (absorbs clock drift)
+    "trigger_mode": "toggle", # Hotkey on a playing sound: "toggle", "restart" or "overlap"
+    "max_voices": 16,         # Sounds that can play at once; the oldest is cut beyond this
+    "pcm_cache_mb": 1024,     # Size limit of the decoded-audio cache
+    "load_workers": 0,        # Decode processes at startup (0 = one per core)
+    "pcm_storage": "mmap",    # "mmap" = page audio from disk, "memory" = keep in RAM
+    "pcm_format": "float32",  # Stored sample format: "float32", "float16" or "int16"
     "sounds": {}  # Will store {filename: {volume: float, hotkey: str}}
 }
 
@@ -48,17 +61,87 @@ def load_config():
     return data
 
 
+# save_config() only marks the config dirty. A background writer flushes
+# it at most every SAVE_INTERVAL seconds, so dragging a slider costs one
+# write rather than one per tick, and skips the write if the JSON has not
+# changed. Each write goes to a temp file renamed over config.json, so a
+# crash mid-write leaves the previous file intact. flush_config() writes
+# anything pending right away; it also runs at interpreter exit.
+SAVE_INTERVAL = 0.5
+
+_save_cond    = threading.Condition()
+_write_lock   = threading.Lock()   # one write at a time (writer vs. flush)
+_pending      = None               # config waiting to be written
+_last_written = None               # JSON of the last successful write
+_writer       = None
+
+
 def save_config(config):
-    """Save configuration to file"""
+    """Schedule config to be saved (see flush_config)"""
+    global _pending, _writer
+    with _save_cond:
+        _pending = config
+        if _writer is None:
+            _writer = threading.Thread(target=_writer_loop, daemon=True)
+            _writer.start()
+        _save_cond.notify()
+    return True
+
+
+def flush_config():
+    """Write any pending config now. Returns False if the write failed."""
+    global _pending
+    with _write_lock:
+        with _save_cond:
+            config, _pending = _pending, None
+        if config is None:
+            return True
+        return _write(config)
+
+
+def _writer_loop():
+    while True:
+        with _save_cond:
+            while _pending is None:
+                _save_cond.wait()
+        time.sleep(SAVE_INTERVAL)   # let further changes pile up
+        try:
+            flush_config()
+        except Exception as e:
+            # Keep the writer alive: later saves still need it
+            print(f"Error saving config: {e}")
+
+
+def _write(config):
+    global _last_written
+    try:
+        text = json.dumps(config, indent=2)
+    except RuntimeError:
+        # Changed while being serialised (UI thread) – try again next round
+        save_config(config)
+        return True
+    except (TypeError, ValueError) as e:
+        print(f"Error saving config: {e}")
+        return False
+    if text == _last_written:
+        return True
+    tmp = CONFIG_FILE + ".tmp"
     try:
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=2)
+        with open(tmp, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, CONFIG_FILE)
+        _last_written = text
         return True
     except Exception as e:
         print(f"Error saving config: {e}")
         return False
 
 
+atexit.register(flush_config)
+
+
 def save_sound_settings(config, sounds):
     """Save all sound-specific settings (volumes, hotkeys)"""
     config["sounds"] = {}
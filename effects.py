@@ -3,9 +3,23 @@
 # Nothing is permanently baked into the audio data.
 # sound["effects"] = {"fade_in": True, "fade_out": False, "echo": True, ...}
 # sound["effect_params"] = {"echo_delay": 0.3, "echo_decay": 0.5, ...}
+#
+# render_voice() is called by the mixer for every playing voice, every block.
+# It reads the voice's window of the source PCM and runs it through the
+# chain normalize → compress → echo → speed → fades. Everything is derived
+# from the voice's source position, so the only per-voice state is that
+# position. Edits rebuild a small per-sound plan on a worker thread (see
+# "Background rendering") which the next block picks up, mid-playback.
+
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
+import pcm_format
+
 def _SR():
     try:
         import sound_manager as _sm
@@ -13,6 +27,18 @@ def _SR():
     except Exception:
         return 48000
 
+
+def share(data: np.ndarray) -> np.ndarray:
+    """Mark data read-only so it can be shared instead of copied.
+
+    Decoded PCM is held once per sound and every view of it – the playing
+    buffer, trims, the editor's reset point – references it directly.
+    Anything that changes samples must produce a new (derived) buffer.
+    """
+    if data.flags.writeable:
+        data.flags.writeable = False
+    return data
+
 # All available effects
 EFFECTS = {
     "fade_in":   "Fade In",
@@ -20,8 +46,8 @@ EFFECTS = {
     "normalize": "Normalize",
     "echo":      "Echo",
     "compress":  "Compress",
-    "speed_up":  "Speed ×1.5",
-    "slow_down": "Speed ×0.75",
+    "reverb":    "Reverb",
+    "speed":     "Speed",
 }
 
 
@@ -34,10 +60,20 @@ def init_sound_effects(sound: dict):
             "echo_delay": 0.3,
             "echo_decay": 0.5,
             "fade_duration": 0.5,
+            "speed": 1.5,
+            "reverb_mix": 0.3,
         }
+    if "source" not in sound:
+        # The decoded PCM, shared read-only; data and original_data start
+        # out as references to it, not copies
+        sound["source"] = share(sound["data"])
+    if "trim" not in sound:
+        # Played region of the source as (start, end) samples
+        sound["trim"] = (0, len(sound["source"]))
     if "original_data" not in sound:
-        # Keep a clean copy of the original so we can re-process any time
-        sound["original_data"] = sound["data"].copy()
+        sound["original_data"] = sound["data"]
+    if "_plan" not in sound:
+        _compile(sound)
 
 
 def get_active_effects(sound: dict) -> list:
@@ -49,95 +85,539 @@ def toggle_effect(sound: dict, effect_key: str) -> bool:
     """Toggle an effect on/off. Returns new state."""
     init_sound_effects(sound)
     current = sound["effects"].get(effect_key, False)
-    sound["effects"][effect_key] = not current
-    # Rebuild processed audio
-    _rebuild(sound)
-    sound["pos"] = 0
+    set_effect(sound, effect_key, not current)
     return not current
 
 
 def set_effect(sound: dict, effect_key: str, enabled: bool):
-    """Explicitly set an effect on or off."""
+    """Explicitly set an effect on or off. Applied in the background."""
     init_sound_effects(sound)
     sound["effects"][effect_key] = enabled
-    _rebuild(sound)
-    sound["pos"] = 0
+    _render(sound)
 
 
 def set_effect_param(sound: dict, param: str, value):
-    """Update an effect parameter and rebuild."""
-    init_sound_effects(sound)
-    sound["effect_params"][param] = value
-    _rebuild(sound)
-    sound["pos"] = 0
+    """Update an effect parameter. Applied in the background."""
+    set_effect_params(sound, {param: value})
 
 
-def _rebuild(sound: dict):
-    """Re-apply all active effects to original_data and store in data."""
+def set_effect_params(sound: dict, values: dict):
+    """Update several effect parameters with a single re-render."""
     init_sound_effects(sound)
-    data = sound["original_data"].copy()
-    params = sound["effect_params"]
-
-    if sound["effects"].get("normalize"):
-        peak = np.max(np.abs(data))
-        if peak > 0:
-            data = data * (0.95 / peak)
-
-    if sound["effects"].get("compress"):
-        threshold, ratio = 0.5, 4.0
-        mask = np.abs(data) > threshold
-        sign = np.sign(data[mask])
-        excess = np.abs(data[mask]) - threshold
-        data[mask] = sign * (threshold + excess / ratio)
-
-    if sound["effects"].get("echo"):
-        delay_s = float(params.get("echo_delay", 0.3))
-        decay   = float(params.get("echo_decay",  0.5))
-        d_smp   = int(delay_s * _SR())
-        out     = np.zeros(len(data) + d_smp, dtype="float32")
-        out[:len(data)] += data
-        out[d_smp:]     += data * decay
-        data = out[:len(data)]
-
-    if sound["effects"].get("speed_up"):
-        indices = np.arange(0, len(data), 1.5)
-        indices = indices[indices < len(data)]
-        data = np.interp(indices, np.arange(len(data)), data).astype("float32")
-
-    elif sound["effects"].get("slow_down"):
-        indices = np.arange(0, len(data), 0.75)
-        indices = indices[indices < len(data)]
-        data = np.interp(indices, np.arange(len(data)), data).astype("float32")
-
-    if sound["effects"].get("fade_in"):
-        smp = min(int(float(params.get("fade_duration", 0.5)) * _SR()), len(data))
-        data[:smp] *= np.linspace(0, 1, smp)
-
-    if sound["effects"].get("fade_out"):
-        smp = min(int(float(params.get("fade_duration", 0.5)) * _SR()), len(data))
-        data[-smp:] *= np.linspace(1, 0, smp)
-
-    sound["data"] = data.astype("float32")
+    sound["effect_params"].update(values)
+    _render(sound)
+
+
+def speed_ratio(sound: dict) -> float:
+    """Source samples consumed per output sample."""
+    fx = sound.get("effects") or {}
+    if fx.get("speed"):
+        speed = float(sound.get("effect_params", {}).get("speed", 1.5))
+        return min(max(speed, SPEED_MIN), SPEED_MAX)
+    return 1.0
+
+
+def playback_seconds(sound: dict) -> float:
+    """How long the sound plays with its current effects.
+
+    Reads the last published render, which the mixer may not have
+    installed yet (sound["data"] / sound["_plan"] are its copies).
+    """
+    plan   = sound.get("_published_plan") or sound.get("_plan") or {}
+    length = len(sound["original_data"]) + plan.get("tail", 0)
+    return length / speed_ratio(sound) / _SR()
+
+
+def _build_plan(sound: dict, src: np.ndarray, region: tuple) -> dict:
+    """Turn the sound's flags and params into the settings render_voice
+    reads every block, for src, the region of the source it will play.
+
+    Stages are cheap to derive except two whole-clip ones: the normalize
+    peak, memoized as sound["_peak"] = (region, peak), and the reverb's wet
+    signal, memoized as sound["_wet"] = (region, key, wet). Each is only
+    recomputed for a different region or different inputs.
+    """
+    fx, params = sound["effects"], sound["effect_params"]
+    sr = _SR()
+
+    gain = 1.0
+    if fx.get("normalize"):
+        memo = sound.get("_peak")
+        if memo is None or memo[0] != region:
+            memo = (region, pcm_format.peak(src))
+            sound["_peak"] = memo
+        if memo[1] > 0:
+            gain = 0.95 / memo[1]
+
+    echo_delay = int(float(params.get("echo_delay", 0.3)) * sr)
+    echo_decay = float(params.get("echo_decay", 0.5))
+
+    wet = None
+    if fx.get("reverb"):
+        name = params.get("reverb_ir") or DEFAULT_IR
+        ir   = impulse_response(name)
+        compress = bool(fx.get("compress"))
+        echo = (echo_delay, echo_decay) if fx.get("echo") else None
+        key  = (name, sr, gain, compress, echo)
+        memo = sound.get("_wet")
+        if memo is None or memo[0] != region or memo[1] != key:
+            memo = (region, key, _reverb_wet(src, ir, gain, compress, echo))
+            sound["_wet"] = memo
+        wet = memo[2]
+    else:
+        # Drop the wet signal with the effect; the mixer keeps its own
+        # reference until the new plan is installed
+        sound.pop("_wet", None)
+
+    fade  = float(params.get("fade_duration", 0.5)) * sr
+    ratio = speed_ratio(sound)
+    return {
+        "dry":        not any(fx.values()),
+        "gain":       gain,
+        "compress":   bool(fx.get("compress")),
+        "echo":       bool(fx.get("echo")),
+        "echo_delay": echo_delay,
+        "echo_decay": echo_decay,
+        "wet":        wet,
+        "wet_mix":    min(max(float(params.get("reverb_mix", 0.3)), 0.0), 1.0),
+        "tail":       0 if wet is None else len(wet) - len(src),
+        "ratio":      ratio,
+        "bank":       None if ratio == 1.0 else _filter_bank(ratio),
+        "fade_in":    fade if fx.get("fade_in")  else 0.0,
+        "fade_out":   fade if fx.get("fade_out") else 0.0,
+    }
+
+
+def _compile(sound: dict):
+    """Build sound["_plan"] synchronously (used when a sound is first set up)."""
+    plan = _build_plan(sound, sound["original_data"], sound["trim"])
+    sound["_plan"] = sound["_published_plan"] = plan
+
+
+# ─────────────────────────────────────────────────────────────
+# Background rendering
+# ─────────────────────────────────────────────────────────────
+# Edits never do O(n) work on the Tk thread. Each one bumps
+# sound["_render_gen"] and queues a render on a small worker pool; the
+# render builds the plan for the new trim region (if any) and hands both
+# to the mixer in one swap command, applied between two blocks. A render
+# whose generation is no longer current when it finishes is thrown away,
+# so the last edit always wins.
+# sound["rendering"] is True while a render is outstanding.
+#
+# A trim is just sound["trim"] = (start, end) in samples over the shared
+# source; the played buffer is the view source[start:end], never a copy,
+# so trimming and undoing it are O(1) and nothing outside the region is
+# lost. The only derived buffer is the reverb's wet signal, made only
+# while that effect is on. A trim not yet published is kept in
+# sound["_next_trim"] so later edits build on it. Because bounds are
+# absolute, a playing voice continues from the same sample after a trim.
+
+_pool = None
+_publish_lock = threading.Lock()
+
+
+def _executor():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="fx-render")
+    return _pool
+
+
+def is_rendering(sound: dict) -> bool:
+    """True while an edit to sound is still being rendered."""
+    return sound.get("rendering", False)
+
+
+def _set_rendering(sound: dict, busy: bool):
+    sound["rendering"] = busy
+    try:
+        import audio_engine as _ae
+        _ae.post_event("render", sound)
+    except Exception:
+        pass
+
+
+def _render(sound: dict, trim: tuple = None):
+    """Queue a re-render of sound, optionally with new trim bounds."""
+    # Under the lock, so a finishing render can't pop _next_trim between
+    # setting it and reading it back, or publish over the new generation
+    with _publish_lock:
+        if trim is not None:
+            sound["_next_trim"] = trim
+        trim = sound.get("_next_trim")
+        gen = sound.get("_render_gen", 0) + 1
+        sound["_render_gen"] = gen
+        if trim is None:
+            data, region = sound["original_data"], sound["trim"]
+        else:
+            data, region = sound["source"][trim[0]:trim[1]], trim
+        _set_rendering(sound, True)
+
+    def job():
+        if sound.get("_render_gen") != gen:
+            return   # superseded while queued
+        try:
+            plan = _build_plan(sound, data, region)
+        except Exception as e:
+            print(f"[fx] render failed: {e}")
+            with _publish_lock:
+                if sound.get("_render_gen") == gen:
+                    _set_rendering(sound, False)
+            return
+        _publish(sound, gen, trim, data, plan)
+
+    _executor().submit(job)
+
+
+def _publish(sound: dict, gen: int, trim, data, plan: dict):
+    """Install a finished render, unless a newer edit has superseded it.
+
+    The buffer and plan go to the mixer in one swap command, so no block
+    ever mixes one render's plan with another render's buffer.
+    """
+    with _publish_lock:
+        if sound.get("_render_gen") != gen:
+            return
+        shift = 0
+        if trim is not None:
+            shift = trim[0] - sound["trim"][0]
+            sound["trim"] = trim
+            sound["original_data"] = data
+            sound.pop("_next_trim", None)
+            for memo_key in ("_peak", "_wet"):
+                memo = sound.get(memo_key)
+                if memo is not None and memo[0] != trim:
+                    sound.pop(memo_key, None)
+        sound["_published_plan"] = plan
+        if plan["wet"] is None:
+            sound.pop("_wet", None)
+        try:
+            import audio_engine as _ae
+            _ae.swap_buffer(sound, data, plan, shift)
+        except Exception as e:
+            print(f"[fx] could not hand new buffer to the mixer: {e}")
+            sound["data"]  = data
+            sound["_plan"] = plan
+        _set_rendering(sound, False)
+
+
+# ─────────────────────────────────────────────────────────────
+# Reverb: FFT convolution with a cached impulse response
+# ─────────────────────────────────────────────────────────────
+# The wet signal is the shaped source (normalize → compress → echo)
+# convolved with the impulse response. It is time-invariant for a given
+# source and settings, so it is rendered once in the background with
+# overlap-add FFT convolution (scipy.signal.oaconvolve: O(n log m) instead
+# of a direct convolution's O(n·m)) and the mixer only crossfades it in.
+# Impulse responses are decoded once at TARGET_SR and shared by every
+# sound. Drop .wav/.flac files into IMPULSES_DIR to add your own; "Room"
+# is built in.
+
+IMPULSES_DIR = "impulses"
+DEFAULT_IR   = "Room"
+
+_irs = {}                    # (name, sr) → float32 impulse response
+_irs_lock = threading.Lock()
+
+
+def list_impulses() -> list:
+    """Names of the available impulse responses."""
+    names = [DEFAULT_IR]
+    if os.path.isdir(IMPULSES_DIR):
+        names += sorted(os.path.splitext(f)[0] for f in os.listdir(IMPULSES_DIR)
+                        if f.lower().endswith((".wav", ".flac", ".ogg")))
+    return names
+
+
+def _room_ir(sr: int, seconds: float = 1.2) -> np.ndarray:
+    """Synthetic room: exponentially decaying noise, darker as it decays."""
+    rng = np.random.default_rng(0)
+    n   = int(seconds * sr)
+    t   = np.arange(n) / sr
+    ir  = rng.standard_normal(n) * np.exp(-6.9 * t / seconds)   # -60 dB at the end
+    # One-pole low-pass whose cutoff falls over time (air absorption)
+    from scipy.signal import lfilter
+    ir  = 0.5 * lfilter([0.5], [1.0, -0.5], ir) + 0.5 * ir * np.exp(-3.0 * t)
+    return ir
+
+
+def impulse_response(name: str) -> np.ndarray:
+    """Decoded impulse response at TARGET_SR, scaled to unit energy.
+    Decoded once per sample rate; every sound shares the same array."""
+    sr = _SR()
+    with _irs_lock:
+        ir = _irs.get((name, sr))
+        if ir is not None:
+            return ir
+        ir = None
+        if name != DEFAULT_IR and os.path.isdir(IMPULSES_DIR):
+            for f in os.listdir(IMPULSES_DIR):
+                if os.path.splitext(f)[0] == name:
+                    try:
+                        import sound_manager as _sm
+                        ir = _sm._decode(os.path.join(IMPULSES_DIR, f), sr)
+                    except Exception as e:
+                        print(f"[fx] could not load impulse {f}: {e}")
+                    break
+        if ir is None:
+            ir = _room_ir(sr)
+        energy = float(np.sqrt(np.sum(np.square(ir, dtype=np.float64))))
+        ir = (ir / energy if energy > 0 else ir).astype(np.float32)
+        ir.flags.writeable = False
+        _irs[(name, sr)] = ir
+        return ir
+
+
+def _reverb_wet(src, ir, gain: float, compress: bool, echo) -> np.ndarray:
+    """Shaped source convolved with ir (len(src) + len(ir) - 1 samples)."""
+    from scipy.signal import oaconvolve
+    x = pcm_format.to_float32(src) * np.float32(gain)
+    if compress:
+        c = np.clip(x, -COMPRESS_THRESHOLD, COMPRESS_THRESHOLD)
+        x = c + (x - c) / COMPRESS_RATIO
+    if echo is not None:
+        d, decay = echo
+        if 0 < d < len(x):
+            x[d:] += decay * x[:-d]
+    return oaconvolve(x, ir).astype(np.float32)
 
 
 # ─────────────────────────────────────────────────────────────
-# Audio-editor helpers (non-destructive trim applied to original_data)
+# Real-time chain (runs in the audio callback – no allocation)
 # ─────────────────────────────────────────────────────────────
 
+COMPRESS_THRESHOLD = 0.5
+COMPRESS_RATIO     = 4.0
+
+_INT16_INV = np.float32(1.0 / pcm_format.INT16_SCALE)
+
+# Scratch shared by every voice: the mixer renders voices one at a time.
+# Grown on demand, so steady-state blocks allocate nothing.
+_seg  = np.zeros(0, dtype="float32")   # source window, processed in place
+_dly  = np.zeros(0, dtype="float32")   # echo tap window
+_wbuf = np.zeros(0, dtype="float32")   # reverb wet window
+_clp  = np.zeros(0, dtype="float32")   # compressor scratch
+_ramp = np.zeros(0, dtype="float32")   # 0, 1, 2, … for fade envelopes
+_env  = np.zeros(0, dtype="float32")   # fade envelope
+# Speed: read positions are float64 (exact over long clips). Every ufunc
+# below gets operands of one dtype – mixed dtypes make numpy buffer.
+_rampd = np.zeros(0, dtype="float64")  # 0, 1, 2, …
+_q     = np.zeros(0, dtype="float64")  # read positions, then their fraction
+_qf    = np.zeros(0, dtype="float64")  # floor of _q
+_qi    = np.zeros(0, dtype=np.intp)    # floor of _q as indices
+_ph    = np.zeros(0, dtype=np.intp)    # filter phase per output sample
+# Resampler scratch is tap-major (TAPS × frames) so every op is a plain
+# 1-D or same-shape ufunc; broadcasting would make numpy buffer.
+_idx   = np.zeros((0, 0), dtype=np.intp)      # seg index of every tap
+_taps  = np.zeros((0, 0), dtype="float32")    # seg[_idx]
+_coef  = np.zeros((0, 0), dtype="float32")    # bank rows for _ph
+
+
+def _ensure_scratch(frames: int, span: int):
+    global _seg, _dly, _wbuf, _clp, _ramp, _env, _rampd, _q, _qf, _qi, _ph, _idx, _taps, _coef
+    if len(_seg) < span:
+        _seg = np.zeros(span, dtype="float32")
+        _dly = np.zeros(span, dtype="float32")
+        _wbuf = np.zeros(span, dtype="float32")
+        _clp = np.zeros(span, dtype="float32")
+    if len(_ramp) < frames:
+        _ramp  = np.arange(frames, dtype="float32")
+        _env   = np.zeros(frames, dtype="float32")
+        _rampd = np.arange(frames, dtype="float64")
+        _q     = np.zeros(frames, dtype="float64")
+        _qf    = np.zeros(frames, dtype="float64")
+        _qi    = np.zeros(frames, dtype=np.intp)
+        _ph    = np.zeros(frames, dtype=np.intp)
+        _idx   = np.zeros((TAPS, frames), dtype=np.intp)
+        _taps  = np.zeros((TAPS, frames), dtype="float32")
+        _coef  = np.zeros((TAPS, frames), dtype="float32")
+
+
+# ─────────────────────────────────────────────────────────────
+# Speed: band-limited polyphase resampler
+# ─────────────────────────────────────────────────────────────
+# Each output sample at source position i + f is a TAPS-long dot product of
+# the source around i with one row of a windowed-sinc filter bank, the row
+# picked by f rounded to 1/PHASES of a sample. Rows are precomputed per
+# ratio; when speeding up, the cutoff drops to 1/ratio of Nyquist so the
+# faster playback does not alias. Cost per output sample is TAPS multiply-
+# adds whatever the ratio, and work is done one mixer block at a time.
+
+TAPS   = 16
+PHASES = 256
+SPEED_MIN, SPEED_MAX = 0.5, 2.0
+
+
+@functools.lru_cache(maxsize=8)
+def _design_bank(cutoff: float) -> np.ndarray:
+    from scipy.signal import firwin
+    proto = firwin(TAPS * PHASES + 1, 0.9 * cutoff / PHASES,
+                   window=("kaiser", 8.0)) * PHASES
+    # bank[k, p] weights source sample i - TAPS/2 + 1 + k for fraction p / PHASES
+    taps = np.arange(TAPS)[:, None]
+    return np.ascontiguousarray(proto[(TAPS - 1 - taps) * PHASES + np.arange(PHASES + 1)],
+                                dtype="float32")
+
+
+def _filter_bank(ratio: float) -> np.ndarray:
+    """Filter bank for playback at ratio; cached, so slider moves are cheap."""
+    return _design_bank(round(min(1.0, 1.0 / ratio), 3))
+
+
+def _read(src, start: int, dst):
+    """Copy src[start:start+len(dst)] into dst, zero outside src."""
+    n, total = len(dst), len(src)
+    a, b = max(start, 0), min(start + n, total)
+    if b <= a:
+        dst.fill(0.0)
+        return
+    if a > start:
+        dst[:a - start].fill(0.0)
+    # Compact storage (pcm_format) is widened here, only for this window:
+    # one casting copy, plus a scaling pass for int16
+    region = dst[a - start:b - start]
+    region[...] = src[a:b]
+    if src.dtype == np.int16:
+        np.multiply(region, _INT16_INV, out=region)
+    if b < start + n:
+        dst[b - start:].fill(0.0)
+
+
+def _shape(x, gain: float, compress: bool):
+    """Normalize gain and compressor, in place."""
+    if gain != 1.0:
+        np.multiply(x, gain, out=x)
+    if compress:
+        # Above the threshold the slope drops to 1/ratio:
+        # y = clip(x) + (x - clip(x)) / ratio
+        c = _clp[:len(x)]
+        np.clip(x, -COMPRESS_THRESHOLD, COMPRESS_THRESHOLD, out=c)
+        np.subtract(x, c, out=x)
+        np.multiply(x, 1.0 / COMPRESS_RATIO, out=x)
+        np.add(x, c, out=x)
+
+
+def render_voice(sound: dict, src, pos: float, out) -> float:
+    """Render the next len(out) samples of sound, starting at source
+    position pos, into out. Returns the new source position, or -1 once
+    the sound has finished (out is zero-padded past the end)."""
+    n, total = len(out), len(src)
+    plan = sound.get("_plan")
+    if plan is None or plan["dry"]:
+        # Dry: straight copy
+        p = int(pos)
+        _read(src, p, out)
+        return p + n if p + n < total else -1.0
+
+    ratio, bank = plan["ratio"], plan["bank"]
+    total += plan["tail"]   # reverb rings on past the end of the source
+
+    # Source window covering this block, plus the resampler's taps
+    a = int(pos)
+    if bank is None:
+        a0, span = a, n
+    else:
+        a0   = a - TAPS // 2 + 1
+        span = int(pos + (n - 1) * ratio) - a + TAPS
+    _ensure_scratch(n, span)
+    seg = _seg[:span]
+
+    gain, compress = plan["gain"], plan["compress"]
+    _read(src, a0, seg)
+    _shape(seg, gain, compress)
+
+    if plan["echo"]:
+        d = plan["echo_delay"]
+        if a0 - d + span > 0:
+            dly = _dly[:span]
+            _read(src, a0 - d, dly)
+            _shape(dly, gain, compress)
+            np.multiply(dly, plan["echo_decay"], out=dly)
+            np.add(seg, dly, out=seg)
+
+    wet = plan["wet"]
+    if wet is not None:
+        mix = plan["wet_mix"]
+        w = _wbuf[:span]
+        _read(wet, a0, w)
+        np.multiply(seg, 1.0 - mix, out=seg)
+        np.multiply(w, mix, out=w)
+        np.add(seg, w, out=seg)
+
+    if bank is None:
+        out[:] = seg
+    else:
+        # Output k reads source position pos + k * ratio = a + qi + f
+        q, qf, qi, ph = _q[:n], _qf[:n], _qi[:n], _ph[:n]
+        idx, taps, coef = _idx[:, :n], _taps[:, :n], _coef[:, :n]
+        np.multiply(_rampd[:n], ratio, out=q)
+        np.add(q, pos - a, out=q)
+        np.floor(q, out=qf)
+        np.subtract(q, qf, out=q)
+        np.multiply(q, PHASES, out=q)
+        np.rint(q, out=q)
+        qi[:] = qf
+        ph[:] = q
+        # Taps for output k are seg[qi[k] : qi[k] + TAPS]
+        for t in range(TAPS):
+            np.add(qi, t, out=idx[t])
+        np.take(seg, idx, out=taps, mode="clip")
+        np.take(bank, ph, axis=1, out=coef, mode="clip")
+        np.einsum("ij,ij->j", taps, coef, out=out)
+
+    # Fades, in output samples: this block starts pos / ratio into the
+    # sound and has (total - pos) / ratio left to play.
+    fade_in, fade_out = plan["fade_in"], plan["fade_out"]
+    if fade_in or fade_out:
+        env = _env[:n]
+        start = pos / ratio
+        fade = min(fade_in, total / ratio)
+        if fade > 1 and start < fade:
+            np.add(_ramp[:n], start, out=env)
+            np.multiply(env, 1.0 / fade, out=env)
+            np.minimum(env, 1.0, out=env)
+            np.multiply(out, env, out=out)
+        left = (total - pos) / ratio
+        fade = min(fade_out, total / ratio)
+        if fade > 1 and left - n < fade:
+            np.subtract(left, _ramp[:n], out=env)
+            np.multiply(env, 1.0 / fade, out=env)
+            np.clip(env, 0.0, 1.0, out=env)
+            np.multiply(out, env, out=out)
+
+    new_pos = pos + n * ratio
+    if new_pos >= total:
+        # Zero anything read past the end (the filter's taps can leak into it)
+        k = int(np.ceil((total - pos) / ratio))
+        if k < n:
+            out[max(k, 0):].fill(0.0)
+        return -1.0
+    return new_pos
+
+
+# ─────────────────────────────────────────────────────────────
+# Audio-editor helpers (non-destructive trim: bounds over the source)
+# ─────────────────────────────────────────────────────────────
+
+def trim_bounds(sound: dict) -> tuple:
+    """(start, end) samples of the source the sound plays, including a
+    trim that is still being rendered."""
+    init_sound_effects(sound)
+    return sound.get("_next_trim") or sound["trim"]
+
+
 def trim_sound(sound: dict, start_sec: float, end_sec: float):
-    """Trim original_data to [start_sec, end_sec] and rebuild."""
+    """Play only [start_sec, end_sec] of the source. O(1): just new bounds."""
     init_sound_effects(sound)
-    original = sound["original_data"]
+    total = len(sound["source"])
     s = max(0, int(start_sec * _SR()))
-    e = min(len(original), int(end_sec * _SR()))
+    e = min(total, int(end_sec * _SR()))
     if e > s:
-        sound["original_data"] = original[s:e].copy()
-        _rebuild(sound)
-        sound["pos"] = 0
+        _render(sound, (s, e))
 
 
-def reset_trim(sound: dict, raw_data: np.ndarray):
-    """Restore the full original audio data (undo all trims)."""
-    sound["original_data"] = raw_data.copy()
-    _rebuild(sound)
-    sound["pos"] = 0
+def reset_trim(sound: dict):
+    """Play the whole source again (undo all trims)."""
+    init_sound_effects(sound)
+    _render(sound, (0, len(sound["source"])))
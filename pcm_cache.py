@@ -0,0 +1,84 @@
+# pcm_cache.py
+# On-disk cache of decoded PCM so startup does not re-run librosa on every file.
+# Each entry is a .npy file holding the peak-normalised mono samples of one
+# sound at one sample rate in one storage format (see pcm_format), keyed by
+# (path, size, mtime, sample rate, format).
+# Hits are memory-mapped read-only; the OS pages them in as they are played.
+# Entries are evicted least-recently-used first once the cache grows too big.
+
+import hashlib
+import os
+import numpy as np
+
+import pcm_format
+from config import get_config_dir
+
+CACHE_DIR = os.path.join(get_config_dir(), "pcm_cache")
+DEFAULT_LIMIT_MB = 1024
+
+
+def _entry_path(path, sr, fmt):
+    st  = os.stat(path)
+    key = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{int(sr)}"
+    if fmt != pcm_format.DEFAULT:
+        key += f"|{fmt}"
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".npy")
+
+
+def load(path, sr, fmt=pcm_format.DEFAULT):
+    """Return a read-only memmap of the cached PCM for path, or None on a miss."""
+    try:
+        entry = _entry_path(path, sr, fmt)
+        if not os.path.exists(entry):
+            return None
+        data = np.load(entry, mmap_mode="r")
+        os.utime(entry)   # mark as recently used for eviction
+        return data
+    except Exception as e:
+        print(f"[cache] bad entry for {path}: {e}")
+        return None
+
+
+def store(path, sr, data, fmt=pcm_format.DEFAULT):
+    """Write decoded PCM for path to the cache, converted to fmt.
+    Returns the entry path or None."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        entry = _entry_path(path, sr, fmt)
+        tmp   = entry + ".tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, pcm_format.encode(np.asarray(data, dtype=np.float32), fmt))
+        os.replace(tmp, entry)
+        return entry
+    except Exception as e:
+        print(f"[cache] could not store {path}: {e}")
+        return None
+
+
+def prune(limit_mb=DEFAULT_LIMIT_MB):
+    """Delete least-recently-used entries until the cache fits in limit_mb."""
+    if not os.path.isdir(CACHE_DIR):
+        return
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        if not name.endswith(".npy"):
+            continue
+        p = os.path.join(CACHE_DIR, name)
+        try:
+            st = os.stat(p)
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+
+    total = sum(size for _, size, _ in entries)
+    limit = int(limit_mb * 1024 * 1024)
+    for _, size, p in sorted(entries):
+        if total <= limit:
+            break
+        try:
+            os.remove(p)
+            total -= size
+        except OSError:
+            # Still memory-mapped by a loaded sound (Windows) – try next time
+            pass
+
@@ -0,0 +1,142 @@
+# ringbuffer.py
+# Lock-free single-producer / single-consumer float32 ring buffer used to
+# pass audio between stream callbacks that run on different schedules.
+# The writer only ever advances _w and the reader only ever advances _r
+# (both monotonic sample counters), so under the GIL neither side needs a
+# lock and neither can block the other. No allocation after __init__.
+
+import numpy as np
+
+
+class RingBuffer:
+    """Jitter buffer between one writer and one reader.
+
+    The reader waits until `target` samples are queued before it starts
+    (and again after every underrun), and drops the oldest samples if the
+    queue grows well past the target, so the delay through the buffer
+    stays close to `target` samples.
+    """
+
+    def __init__(self, capacity: int, target: int = 0):
+        self._buf = np.zeros(int(capacity), dtype="float32")
+        self._cap = int(capacity)
+        self._w = 0
+        self._r = 0
+        self._primed = False
+        self.target = min(int(target), self._cap // 2)
+        self.underruns = 0   # reader found fewer samples than it needed
+        self.overruns  = 0   # writer found it full, or reader had to drop
+        self.avg_fill  = 0.0 # smoothed queue depth seen by the reader
+        self._ramp = self._scratch = self._diff = None   # read_resampled scratch
+
+    @property
+    def capacity(self) -> int:
+        return self._cap
+
+    @property
+    def fill(self) -> int:
+        return self._w - self._r
+
+    def reset(self):
+        """Drop everything queued. Only call while neither side is running."""
+        self._r = self._w
+        self._primed = False
+
+    def write(self, x) -> int:
+        """Append samples; whatever doesn't fit is dropped. Returns samples written."""
+        n = min(len(x), self._cap - (self._w - self._r))
+        if n < len(x):
+            self.overruns += 1
+        if n <= 0:
+            return 0
+        i = self._w % self._cap
+        k = min(n, self._cap - i)
+        self._buf[i:i + k] = x[:k]
+        if k < n:
+            self._buf[:n - k] = x[k:n]
+        self._w += n
+        return n
+
+    def _take(self, dst, k):
+        """Copy the k oldest queued samples into dst[:k] and consume them."""
+        i = self._r % self._cap
+        j = min(k, self._cap - i)
+        dst[:j] = self._buf[i:i + j]
+        if j < k:
+            dst[j:k] = self._buf[:k - j]
+        self._r += k
+
+    def read(self, out) -> int:
+        """Fill out with the oldest queued samples, zero-padding on underrun.
+
+        Returns how many real samples were delivered.
+        """
+        n    = len(out)
+        fill = self._w - self._r
+        self.avg_fill += 0.05 * (fill - self.avg_fill)
+
+        if not self._primed:
+            if fill < self.target + n:
+                out.fill(0.0)
+                return 0
+            self._primed = True
+        elif fill - n > 2 * self.target + n:
+            # Writer is running ahead – drop the oldest to get back to target
+            self._r += fill - n - self.target
+            self.overruns += 1
+            fill = self._w - self._r
+
+        k = min(n, fill)
+        self._take(out, k)
+        if k < n:
+            out[k:].fill(0.0)
+            self.underruns += 1
+            self._primed = False
+        return k
+
+    def read_resampled(self, out) -> int:
+        """Like read(), but for a reader on a different clock than the writer.
+
+        When the smoothed depth drifts away from target, this consumes one
+        sample more (or fewer) than len(out) and linearly stretches it to
+        fit, so the depth stays put instead of slowly running into an
+        underrun or overrun. One sample per block corrects about 1000 ppm
+        at 1024 frames / 48 kHz, far more than real sound-card clocks drift.
+        """
+        n = len(out)
+        if not self._primed or n < 3:
+            return self.read(out)
+
+        drift = self.avg_fill - n - self.target
+        slack = max(32, self.target // 8)
+        if drift > slack:
+            m = n + 1
+        elif drift < -slack:
+            m = n - 1
+        else:
+            return self.read(out)
+        if self._w - self._r < m:
+            return self.read(out)
+
+        if self._ramp is None or len(self._ramp) != n:
+            # Only reallocated if the reader's block size changes
+            self._ramp = np.linspace(0.0, 1.0, n, dtype="float32")
+            self._scratch = np.zeros(n + 1, dtype="float32")
+            self._diff = np.zeros(n, dtype="float32")
+        self.avg_fill += 0.05 * ((self._w - self._r) - self.avg_fill)
+
+        src, d, w = self._scratch, self._diff, self._ramp
+        self._take(src, m)
+        if m > n:
+            # out[k] = src at position k * n / (n - 1)  (compress n+1 → n)
+            np.subtract(src[1:n + 1], src[:n], out=d)
+            np.multiply(d, w, out=d)
+            np.add(src[:n], d, out=out)
+        else:
+            # out[k] = src at position k * (n - 2) / (n - 1)  (stretch n-1 → n)
+            src[n - 1] = src[n - 2]
+            d[0] = 0.0
+            np.subtract(src[:n - 1], src[1:n], out=d[1:])
+            np.multiply(d, w, out=d)
+            np.add(src[:n], d, out=out)
+        return n
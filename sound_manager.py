@@ -5,6 +5,9 @@ import tkinter.filedialog as fd
 import numpy as np
 import librosa
 
+import pcm_cache
+import pcm_format
+
 SOUNDS_DIR = "sounds"
 SUPPORTED_EXTS = (".wav", ".mp3", ".ogg", ".flac")
 
@@ -27,61 +30,246 @@ def set_target_sr(sr: int):
     print(f"[sound_manager] target SR = {sr}")
 
 
+def _decode(path, sr):
+    """Decode path to peak-normalised float32 mono at sr.
+
+    Module-level so it can run in a worker process.
+    """
+    # librosa.load with explicit sr= handles mono conversion,
+    # resampling, and format decoding (including mp3) correctly.
+    data, _ = librosa.load(path, sr=sr, mono=True)
+    peak = np.max(np.abs(data))
+    if peak > 0:
+        data = data / peak
+    return data.astype(np.float32)
+
+
+def use_mmap():
+    """True when library PCM should live in memory-mapped files
+    (config "pcm_storage": "mmap") rather than resident arrays ("memory")."""
+    return _config.get("pcm_storage", "mmap") == "mmap"
+
+
+def pcm_format_name():
+    """Sample format library PCM is stored in (config "pcm_format":
+    "float32", "float16" or "int16" – see pcm_format)."""
+    fmt = _config.get("pcm_format", pcm_format.DEFAULT)
+    return fmt if fmt in pcm_format.FORMATS else pcm_format.DEFAULT
+
+
+def _load_workers():
+    """Number of decode processes from config ("load_workers", 0 = one per core)."""
+    n = int(_config.get("load_workers", 0) or 0)
+    return n if n > 0 else (os.cpu_count() or 1)
+
+
+# Below this many misses a process pool costs more than it saves: under
+# spawn (the Windows default) every worker re-imports librosa, ~3 s before
+# the first file is decoded, while a short clip decodes in-process in ms.
+POOL_MIN_FILES = 8
+
+
+def _decode_many(paths, parallel=True):
+    """Yield (path, data, error) for each path, in order.
+
+    With parallel and at least POOL_MIN_FILES to decode, uses a process
+    pool so librosa's decode and resample run on every core; otherwise
+    decodes in this process.
+    """
+    workers = min(_load_workers(), len(paths))
+    pool = None
+    if parallel and workers > 1 and len(paths) >= POOL_MIN_FILES:
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(max_workers=workers)
+        except Exception as e:
+            print(f"[sound] process pool unavailable ({e}), decoding serially")
+
+    if pool is None:
+        for path in paths:
+            try:
+                yield path, _decode(path, TARGET_SR), None
+            except Exception as e:
+                yield path, None, e
+        return
+
+    with pool:
+        futures = [pool.submit(_decode, path, TARGET_SR) for path in paths]
+        for path, fut in zip(paths, futures):
+            try:
+                yield path, fut.result(), None
+            except Exception as e:
+                yield path, None, e
+
+
+def _new_entry(data):
+    # One read-only buffer per sound; effects and the editor reference it
+    # (and views of it) rather than copying
+    if data.flags.writeable:
+        data.flags.writeable = False
+    return {
+        "data":     data,
+        "playing":  False,
+        "volume":   1.0,
+        "hotkey":   None,
+    }
+
+
+def _report_loaded(file, data):
+    duration = len(data) / TARGET_SR
+    print(f"[sound] loaded {file}: {len(data)} samples at {TARGET_SR} Hz = {duration:.3f}s")
+    if duration < 1.0:
+        print(f"[sound] WARNING: {file} is suspiciously short!")
+
+
+def _load_paths(paths, parallel=True):
+    """Return ({filename: data}, cache_hits) for paths.
+
+    Misses are decoded (see _decode_many for parallel) and stored in the
+    cache. Results are
+    in the configured sample format. In mmap storage mode every result is
+    a read-only memmap of its cache entry; otherwise the PCM is read into
+    RAM. Files that fail to decode are reported and left out.
+    """
+    mmap = use_mmap()
+    fmt  = pcm_format_name()
+    loaded = {}
+    misses = []
+    for path in paths:
+        data = pcm_cache.load(path, TARGET_SR, fmt)
+        if data is None:
+            misses.append(path)
+        else:
+            loaded[os.path.basename(path)] = data if mmap else np.array(data)
+    hits = len(loaded)
+
+    for path, data, err in _decode_many(misses, parallel):
+        file = os.path.basename(path)
+        if err is not None:
+            print(f"[sound] error loading {file}: {err}")
+            continue
+        mm = None
+        if pcm_cache.store(path, TARGET_SR, data, fmt) and mmap:
+            mm = pcm_cache.load(path, TARGET_SR, fmt)
+        loaded[file] = mm if mm is not None else pcm_format.encode(data, fmt)
+    return loaded, hits
+
+
 def load_sounds():
-    """Load all sounds from disk, resampled to TARGET_SR by librosa."""
+    """Load all sounds from disk, resampled to TARGET_SR by librosa.
+
+    Decoded PCM is kept in pcm_cache; cache hits are memory-mapped and
+    only files that changed (or are new) are decoded, in parallel.
+    Sounds are added in sorted filename order.
+    """
     global sounds
+    stop_all_sounds()
     sounds.clear()
     os.makedirs(SOUNDS_DIR, exist_ok=True)
-    for file in os.listdir(SOUNDS_DIR):
-        if not file.lower().endswith(SUPPORTED_EXTS):
+    files = sorted(f for f in os.listdir(SOUNDS_DIR)
+                   if f.lower().endswith(SUPPORTED_EXTS))
+
+    loaded, hits = _load_paths([os.path.join(SOUNDS_DIR, f) for f in files])
+    for file in files:
+        if file in loaded:
+            sounds[file] = _new_entry(loaded[file])
+            _report_loaded(file, loaded[file])
+    print(f"[sound] {hits}/{len(sounds)} sounds from cache, {len(sounds) - hits} decoded")
+    pcm_cache.prune(_config.get("pcm_cache_mb", pcm_cache.DEFAULT_LIMIT_MB))
+
+
+def load_files(names):
+    """Load (or re-load) the given files from SOUNDS_DIR without touching
+    any other entry. Returns the names that loaded successfully.
+
+    A name that is already in the library is replaced by a fresh entry
+    that keeps its volume and hotkey; its effects and trim start over
+    because the audio itself has changed.
+    """
+    paths = [os.path.join(SOUNDS_DIR, n) for n in names]
+    # Imports are a handful of files: decode in-process rather than pay
+    # for a pool spinning up
+    loaded, _ = _load_paths(paths, parallel=False)
+    done = []
+    for name in names:
+        if name not in loaded:
+            continue
+        entry = _new_entry(loaded[name])
+        old = sounds.get(name)
+        if old is not None:
+            _stop(old)
+            entry["volume"] = old.get("volume", 1.0)
+            entry["hotkey"] = old.get("hotkey")
+        sounds[name] = entry
+        _report_loaded(name, loaded[name])
+        done.append(name)
+    return done
+
+
+def import_files(paths):
+    """Copy audio files into SOUNDS_DIR and load just those.
+
+    Returns the names that were added (or replaced) in sounds.
+    """
+    os.makedirs(SOUNDS_DIR, exist_ok=True)
+    names = []
+    for src in paths:
+        if not src.lower().endswith(SUPPORTED_EXTS):
             continue
-        path = os.path.join(SOUNDS_DIR, file)
+        name = os.path.basename(src)
+        dst  = os.path.join(SOUNDS_DIR, name)
         try:
-            # librosa.load with explicit sr= handles mono conversion,
-            # resampling, and format decoding (including mp3) correctly.
-            data, _ = librosa.load(path, sr=TARGET_SR, mono=True)
-            peak = np.max(np.abs(data))
-            if peak > 0:
-                data = data / peak
-            sounds[file] = {
-                "data":     data.astype(np.float32),
-                "pos":      0,
-                "playing":  False,
-                "volume":   1.0,
-                "hotkey":   None,
-            }
-            duration = len(data) / TARGET_SR
-            print(f"[sound] loaded {file}: {len(data)} samples at {TARGET_SR} Hz = {duration:.3f}s")
-            if duration < 1.0:
-                print(f"[sound] WARNING: {file} is suspiciously short!")
+            if not (os.path.exists(dst) and os.path.samefile(src, dst)):
+                shutil.copy2(src, dst)
+            names.append(name)
         except Exception as e:
-            print(f"[sound] error loading {file}: {e}")
+            print(f"[sound] could not import {src}: {e}")
+    return load_files(names)
 
 
 def toggle_sound(name):
     if name in sounds:
-        s = sounds[name]
-        s["playing"] = not s["playing"]
-        s["pos"] = 0
+        import audio_engine as _ae
+        _ae.toggle_voice(sounds[name])
+
+
+def trigger_sound(name):
+    """Hotkey action. On a sound that is already playing, config
+    "trigger_mode" picks: "toggle" stops it, "restart" plays it from the
+    top, "overlap" starts another voice on top of the ones playing."""
+    if name not in sounds:
+        return
+    import audio_engine as _ae
+    mode = _config.get("trigger_mode", "toggle")
+    if mode == "overlap":
+        _ae.start_voice(sounds[name])
+    elif mode == "restart":
+        _ae.restart_voice(sounds[name])
+    else:
+        _ae.toggle_voice(sounds[name])
+
+
+def _stop(s):
+    import audio_engine as _ae
+    _ae.stop_voice(s)
 
 
 def stop_all_sounds():
-    for s in sounds.values():
-        s["playing"] = False
-        s["pos"] = 0
+    import audio_engine as _ae
+    _ae.stop_all_voices()
 
 
 def add_sound():
+    """Ask for a file and import it. Returns the names added."""
     file = fd.askopenfilename(filetypes=[("Audio Files", SUPPORTED_EXTS)])
     if file:
-        os.makedirs(SOUNDS_DIR, exist_ok=True)
-        dst = os.path.join(SOUNDS_DIR, os.path.basename(file))
-        shutil.copy2(file, dst)
-        load_sounds()
+        return import_files([file])
+    return []
 
 
 def remove_sound(name):
     if name in sounds:
+        _stop(sounds[name])
         path = os.path.join(SOUNDS_DIR, name)
         if os.path.exists(path):
             os.remove(path)
@@ -90,7 +278,8 @@ def remove_sound(name):
 
 def set_sound_volume(name, volume):
     if name in sounds:
-        sounds[name]["volume"] = float(volume)
+        import audio_engine as _ae
+        _ae.set_volume(sounds[name], volume)
 
 
 def set_hotkey(name, hotkey):
@@ -118,6 +307,6 @@ def _register_hotkey(name, hotkey):
             keyboard.remove_hotkey(hotkey)
         except Exception:
             pass
-        keyboard.add_hotkey(hotkey, lambda n=name: toggle_sound(n))
+        keyboard.add_hotkey(hotkey, lambda n=name: trigger_sound(n))
     except Exception as e:
         print(f"[hotkey] could not register {hotkey}: {e}")
@@ -0,0 +1,116 @@
+# test_mixer_alloc.py
+# The mixer callback must not allocate sample buffers once it is warmed up:
+# every numpy op in _vmic_cb / render_voice / Limiter writes into
+# preallocated scratch. Allocation is measured with tracemalloc (numpy
+# reports its data buffers to it) over a few hundred blocks.
+
+import os
+import sys
+import tracemalloc
+import types
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# No audio hardware needed: the callback is driven by hand
+sys.modules.setdefault("sounddevice", types.ModuleType("sounddevice"))
+
+import audio_engine as ae   # noqa: E402
+import effects as fx        # noqa: E402
+from ringbuffer import RingBuffer  # noqa: E402
+
+SR     = 48000
+FRAMES = 1024
+WARMUP = 20
+BLOCKS = 300
+
+
+class _Stream:
+    active = True
+
+
+def _sound(seconds, seed):
+    rng  = np.random.default_rng(seed)
+    data = (rng.uniform(-0.5, 0.5, int(SR * seconds))).astype(np.float32)
+    data.flags.writeable = False
+    return {"data": data, "playing": False, "volume": 0.8, "hotkey": None}
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """Engine with the monitor bus on and streams 'running' (commands queue)."""
+    monkeypatch.setattr(fx, "_SR", lambda: SR)
+    monkeypatch.setattr(ae, "SR", SR)
+    ae.init({"mic_volume": 1.0, "headphone_volume": 1.0, "max_voices": 8}, {})
+    ae._stop_all()
+    ae._ensure_voices(8)
+    ae._ensure_scratch(FRAMES)
+    monkeypatch.setattr(ae, "_monitor_stream", _Stream())
+    monkeypatch.setattr(ae, "_monitor_ring", RingBuffer(SR, FRAMES))
+    monkeypatch.setattr(ae, "_vmic_stream", _Stream())
+    yield ae
+    ae._stop_all()
+    while ae._events.qsize():
+        ae._events.get()
+
+
+def _prepare(sounds, effects):
+    # Plans are built synchronously: a background render still running
+    # would show up in the measurement
+    for s in sounds:
+        fx.init_sound_effects(s)
+        for k in effects:
+            s["effects"][k] = True
+        fx._compile(s)
+
+
+def _block_allocation():
+    """Largest traced-memory rise over baseline while mixing BLOCKS blocks."""
+    out = np.zeros((FRAMES, 1), dtype=np.float32)
+    for _ in range(WARMUP):
+        ae._vmic_cb(out, FRAMES, None, None)
+
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(BLOCKS):
+            ae._vmic_cb(out, FRAMES, None, None)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - base
+
+
+def _play(sounds):
+    for s in sounds:
+        ae.start_voice(s)
+    ae._drain()
+    assert len(ae._active) == len(sounds)
+
+
+def test_dry_path_does_not_allocate(engine):
+    sounds = [_sound(20, i) for i in range(4)]
+    _prepare(sounds, ())
+    _play(sounds)
+    rise = _block_allocation()
+    assert len(ae._active) == len(sounds)   # still mixing all of them
+    assert rise < FRAMES * 4, f"mixer allocated {rise} bytes"
+
+
+def test_effects_chain_does_not_allocate(engine):
+    chains = [
+        ("echo", "compress"),
+        ("speed", "fade_in", "fade_out"),
+        ("normalize", "reverb"),
+        ("echo", "compress", "speed", "fade_in", "fade_out", "reverb"),
+    ]
+    sounds = [_sound(20, i) for i in range(len(chains))]
+    for s, chain in zip(sounds, chains):
+        _prepare([s], chain)
+        assert fx.get_active_effects(s) == [k for k in fx.EFFECTS if k in chain]
+    _play(sounds)
+    rise = _block_allocation()
+    assert len(ae._active) == len(sounds)
+    assert rise < FRAMES * 4, f"mixer allocated {rise} bytes"
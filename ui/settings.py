@@ -143,6 +143,65 @@ def open_settings_window(parent, config, on_apply):
     else:
         monout_var.set("None (disabled)")
 
+    # ── LATENCY ───────────────────────────────────────────────
+    sec_lat = _section("Latency",
+                       "Smaller blocks = less delay but more CPU. If the device "
+                       "can't keep up, a bigger block is used automatically.")
+    BLOCK_LABELS = {b: f"{b} frames" for b in (128, 256, 512, 1024, 2048)}
+    REV_BLOCK    = {v: k for k, v in BLOCK_LABELS.items()}
+    block_var = tk.StringVar(value=BLOCK_LABELS.get(int(config.get("block_size", 1024)),
+                                                    "1024 frames"))
+    _dropdown(sec_lat, block_var, list(BLOCK_LABELS.values()))
+
+    LATENCY_LABELS = {"low": "Low latency", "high": "Safe (high latency)"}
+    REV_LATENCY    = {v: k for k, v in LATENCY_LABELS.items()}
+    latency_var = tk.StringVar(value=LATENCY_LABELS.get(config.get("latency", "high"),
+                                                        "Safe (high latency)"))
+    _dropdown(sec_lat, latency_var, list(LATENCY_LABELS.values()))
+
+    def _latency_text():
+        try:
+            import audio_engine as _ae
+            info = _ae.get_latency_info()
+        except Exception:
+            info = None
+        if not info:
+            return "Audio is not running"
+        txt = f"Now: {info['block']} frames ({info['block_ms']:.1f} ms)"
+        if info["block"] != info["requested_block"]:
+            txt += f" – fell back from {info['requested_block']}"
+        ms = [f"{name} {info[k]:.1f} ms" for k, name in
+              (("output_ms", "cable out"), ("input_ms", "mic in"),
+               ("monitor_ms", "headphones"), ("mic_to_cable_ms", "mic → cable"),
+               ("limiter_ms", "limiter look-ahead"))
+              if info[k] is not None]
+        if ms:
+            txt += "\n" + "  ·  ".join(ms)
+        return txt
+
+    lat_lbl = tk.Label(sec_lat, text=_latency_text(), bg=_c("CARD"), fg=_c("ACCENT"),
+                       font=_c("FONT_MONO"), justify="left")
+    lat_lbl.pack(anchor="w", padx=16, pady=(0, 12))
+    _bind_w(lat_lbl)
+
+    # ── PLAYBACK ──────────────────────────────────────────────
+    sec_play = _section("Playback",
+                        "What a hotkey does to a sound that is already playing, "
+                        "and how many sounds can overlap before the oldest is cut.")
+    TRIGGER_LABELS = {"toggle":  "Stop it",
+                      "restart": "Restart it",
+                      "overlap": "Play it again on top"}
+    REV_TRIGGER    = {v: k for k, v in TRIGGER_LABELS.items()}
+    trigger_var = tk.StringVar(value=TRIGGER_LABELS.get(config.get("trigger_mode", "toggle"),
+                                                        "Stop it"))
+    _dropdown(sec_play, trigger_var, list(TRIGGER_LABELS.values()))
+
+    VOICE_LABELS = {n: f"{n} voices" for n in (8, 16, 32, 64)}
+    REV_VOICES   = {v: k for k, v in VOICE_LABELS.items()}
+    voices_var = tk.StringVar(value=VOICE_LABELS.get(int(config.get("max_voices", 16)),
+                                                     "16 voices"))
+    _dropdown(sec_play, voices_var, list(VOICE_LABELS.values()))
+
     # ── INFO BOX ──────────────────────────────────────────────
     info = tk.Frame(body, bg=_c("ACCENT_DARK"),
                     highlightbackground=_c("ACCENT"), highlightthickness=1)
@@ -191,6 +250,14 @@ def open_settings_window(parent, config, on_apply):
                 else int(hv.split(":")[0])
             )
 
+            # ── Block size / latency
+            config["block_size"] = REV_BLOCK.get(block_var.get(), 1024)
+            config["latency"]    = REV_LATENCY.get(latency_var.get(), "high")
+
+            # ── Playback
+            config["trigger_mode"] = REV_TRIGGER.get(trigger_var.get(), "toggle")
+            config["max_voices"]   = REV_VOICES.get(voices_var.get(), 16)
+
             # Apply the new theme NOW before on_apply rebuilds the UI
             T.set_theme(new_theme)
 
@@ -10,10 +10,12 @@ import tkinter as tk
 from tkinter import messagebox
 import numpy as np
 import themes as T
+import pcm_format
 
 from effects import (
     EFFECTS, init_sound_effects, toggle_effect,
-    set_effect_param, trim_sound, reset_trim,
+    set_effect_params, trim_sound, reset_trim, trim_bounds, playback_seconds,
+    is_rendering, list_impulses, SPEED_MIN, SPEED_MAX, DEFAULT_IR,
 )
 
 def _get_sr():
@@ -29,11 +31,76 @@ def _c(n):
     return getattr(T, n)
 
 
+# ─────────────────────────────────────────────────────────────
+# PEAK PYRAMID
+# ─────────────────────────────────────────────────────────────
+# Min/max of every PEAK_BLOCK samples, then of every 2 of those, and so
+# on. Built once per source buffer and cached on the sound as
+# sound["_peaks"] = (source, levels); a new source (reload) rebuilds it.
+# Drawing at any width picks the finest level with at least one block
+# per pixel and reduces it with one reduceat – no per-pixel Python loop.
+
+PEAK_BLOCK = 64
+
+
+def _build_peaks(data):
+    levels = []
+    n  = len(data) // PEAK_BLOCK * PEAK_BLOCK
+    k  = pcm_format.scale(data.dtype)
+    if n:
+        blocks = np.asarray(data[:n]).reshape(-1, PEAK_BLOCK)
+        mn = blocks.min(axis=1).astype(np.float32) * np.float32(k)
+        mx = blocks.max(axis=1).astype(np.float32) * np.float32(k)
+        while True:
+            levels.append((mn, mx))
+            if len(mn) < 2:
+                break
+            m  = len(mn) // 2 * 2
+            mn = np.minimum(mn[:m:2], mn[1:m:2])
+            mx = np.maximum(mx[:m:2], mx[1:m:2])
+    return levels
+
+
+def peak_pyramid(sound):
+    """The sound's cached min/max pyramid (list of (min, max) arrays,
+    finest first; block size of level i is PEAK_BLOCK * 2**i)."""
+    src  = sound["source"]
+    memo = sound.get("_peaks")
+    if memo is None or memo[0] is not src:
+        memo = (src, _build_peaks(src))
+        sound["_peaks"] = memo
+    return memo[1]
+
+
+def peaks_for_width(sound, width):
+    """(mins, maxs) float arrays with one entry per pixel column."""
+    src = sound["source"]
+    n   = len(src)
+    if n == 0 or width < 1:
+        return np.zeros(0, np.float32), np.zeros(0, np.float32)
+    spp    = n / width
+    levels = peak_pyramid(sound)
+    lvl    = int(np.log2(spp / PEAK_BLOCK)) if spp >= PEAK_BLOCK else -1
+    if lvl < 0 or not levels:
+        # Fewer than PEAK_BLOCK samples per pixel: reduce the samples themselves
+        mn = mx = pcm_format.to_float32(src)
+    else:
+        mn, mx = levels[min(lvl, len(levels) - 1)]
+    edges = (np.arange(width) * (len(mn) / width)).astype(np.intp)
+    edges = np.minimum(edges, len(mn) - 1)
+    return np.minimum.reduceat(mn, edges), np.maximum.reduceat(mx, edges)
+
+
 # ─────────────────────────────────────────────────────────────
 # WAVEFORM CANVAS
 # ─────────────────────────────────────────────────────────────
 class WaveformCanvas(tk.Canvas):
-    """Waveform display with draggable trim handles. No stipple used."""
+    """Waveform display with draggable trim handles. No stipple used.
+
+    Items are created once and then only moved: the waveform polygon is
+    re-shaped on resize (or new data), while a handle drag just updates
+    the coords / text of the overlays, handles and labels.
+    """
 
     HANDLE_W = 10   # half-width of grab zone around each handle
 
@@ -46,11 +113,28 @@ class WaveformCanvas(tk.Canvas):
 
         self._sound = sound
         self._drag  = None  # "left" or "right"
+        self._wave_key = None   # (width, height, id(source)) last drawn
 
-        total = max(len(sound.get("original_data", sound["data"])) / _get_sr(), 0.001)
-        self._total      = total
+        self._total      = 0.001
         self._trim_start = 0.0
-        self._trim_end   = total
+        self._trim_end   = 0.0
+        self._load_trim()
+
+        # Persistent items, bottom to top
+        dim = _c("PANEL")
+        self._wave    = self.create_polygon(0, 0, 0, 0, fill=_c("ACCENT"),
+                                            outline=_c("ACCENT"))
+        self._dim_l   = self.create_rectangle(0, 0, 0, 0, fill=dim, outline="")
+        self._dim_r   = self.create_rectangle(0, 0, 0, 0, fill=dim, outline="")
+        self._centre  = self.create_line(0, 0, 0, 0, fill=_c("BORDER"), dash=(2, 4))
+        self._line_l  = self.create_line(0, 0, 0, 0, fill=_c("SUCCESS"), width=2)
+        self._line_r  = self.create_line(0, 0, 0, 0, fill=_c("DANGER"),  width=2)
+        self._grip_l  = self.create_rectangle(0, 0, 0, 0, fill=_c("SUCCESS"), outline="")
+        self._grip_r  = self.create_rectangle(0, 0, 0, 0, fill=_c("DANGER"),  outline="")
+        self._label_l = self.create_text(0, 10, anchor="w", text="",
+                                         fill=_c("TXT"), font=_c("FONT_MONO"))
+        self._label_r = self.create_text(0, 10, anchor="e", text="",
+                                         fill=_c("TXT"), font=_c("FONT_MONO"))
 
         self.bind("<Configure>",       self._draw)
         self.bind("<ButtonPress-1>",   self._press)
@@ -72,60 +156,57 @@ class WaveformCanvas(tk.Canvas):
 
     # ── drawing ──────────────────────────────────────────────
     def _draw(self, _event=None):
+        """Full redraw: waveform (if the size or data changed) and overlays."""
         try:
-            self.delete("all")
             w = self.winfo_width()
             h = self.winfo_height()
             if w < 4 or h < 4:
                 return
+            key = (w, h, id(self._sound["source"]))
+            if key != self._wave_key:
+                self._draw_wave(w, h)
+                self._wave_key = key
+            self._draw_overlays()
+        except Exception as e:
+            print(f"[waveform] draw error: {e}")
 
-            data = self._sound.get("original_data", self._sound["data"])
-            samples = len(data)
-            mid = h // 2
-            amp = mid * 0.88
-
-            # Waveform bars
-            for px in range(w):
-                i0 = int(px * samples / w)
-                i1 = min(samples, i0 + max(1, samples // w))
-                chunk = data[i0:i1]
-                peak = float(np.max(np.abs(chunk))) if len(chunk) else 0.0
-                yt = mid - int(peak * amp)
-                yb = mid + int(peak * amp)
-                self.create_line(px, yt, px, yb, fill=_c("ACCENT"), width=1)
+    def _draw_wave(self, w, h):
+        mid = h // 2
+        amp = mid * 0.88
 
+        # One polygon: top edge along the maxima and back along the minima
+        mn, mx = peaks_for_width(self._sound, w)
+        if not len(mn):
+            self.coords(self._wave, 0, mid, w, mid, w, mid, 0, mid)
+        else:
+            xs  = np.arange(len(mn), dtype=np.float32)
+            top = np.column_stack((xs, mid - np.minimum(mx, 1.0) * amp))
+            bot = np.column_stack((xs, mid - np.maximum(mn, -1.0) * amp - 1))[::-1]
+            self.coords(self._wave, np.concatenate((top, bot)).ravel().tolist())
+        self.coords(self._centre, 0, mid, w, mid)
+
+    def _draw_overlays(self):
+        """Move the dimmed regions, handles and time labels to the trim bounds."""
+        try:
+            w = self.winfo_width()
+            h = self.winfo_height()
             lx = self._sec_to_x(self._trim_start)
             rx = self._sec_to_x(self._trim_end)
-
-            # Dimmed regions outside the trim selection – solid dark overlay
-            dim = _c("PANEL")
-            if lx > 0:
-                self.create_rectangle(0, 0, lx, h, fill=dim, outline="")
-            if rx < w:
-                self.create_rectangle(rx, 0, w, h, fill=dim, outline="")
-
-            # Centre-line
-            self.create_line(0, mid, w, mid, fill=_c("BORDER"), dash=(2, 4))
-
-            # Trim handle lines
-            self.create_line(lx, 0, lx, h, fill=_c("SUCCESS"), width=2)
-            self.create_line(rx, 0, rx, h, fill=_c("DANGER"),  width=2)
-
-            # Handle grip rectangles (top)
             hw = self.HANDLE_W
-            self.create_rectangle(lx - hw, 0, lx + hw, 20,
-                                  fill=_c("SUCCESS"), outline="")
-            self.create_rectangle(rx - hw, 0, rx + hw, 20,
-                                  fill=_c("DANGER"),  outline="")
-
-            # Time labels
-            self.create_text(lx + hw + 2, 10, anchor="w",
-                             text=f"{self._trim_start:.2f}s",
-                             fill=_c("TXT"), font=_c("FONT_MONO"))
-            self.create_text(rx - hw - 2, 10, anchor="e",
-                             text=f"{self._trim_end:.2f}s",
-                             fill=_c("TXT"), font=_c("FONT_MONO"))
 
+            # Dimmed regions outside the trim selection – solid dark overlay
+            self.coords(self._dim_l, 0, 0, max(lx, 0), h)
+            self.coords(self._dim_r, min(rx, w), 0, w, h)
+
+            self.coords(self._line_l, lx, 0, lx, h)
+            self.coords(self._line_r, rx, 0, rx, h)
+            self.coords(self._grip_l, lx - hw, 0, lx + hw, 20)
+            self.coords(self._grip_r, rx - hw, 0, rx + hw, 20)
+
+            self.coords(self._label_l, lx + hw + 2, 10)
+            self.coords(self._label_r, rx - hw - 2, 10)
+            self.itemconfig(self._label_l, text=f"{self._trim_start:.2f}s")
+            self.itemconfig(self._label_r, text=f"{self._trim_end:.2f}s")
         except Exception as e:
             print(f"[waveform] draw error: {e}")
 
@@ -149,16 +230,21 @@ class WaveformCanvas(tk.Canvas):
             self._trim_start = min(sec, self._trim_end - 0.05)
         else:
             self._trim_end = max(sec, self._trim_start + 0.05)
-        self._draw()
+        self._draw_overlays()
 
     def _release(self, e):
         self._drag = None
 
-    def reset_handles(self):
-        total = max(len(self._sound.get("original_data", self._sound["data"])) / _get_sr(), 0.001)
-        self._total      = total
-        self._trim_start = 0.0
-        self._trim_end   = total
+    def _load_trim(self):
+        # The whole source is shown; handles sit on the current trim bounds
+        sr = _get_sr()
+        s, e = trim_bounds(self._sound)
+        self._total      = max(len(self._sound["source"]) / sr, 0.001)
+        self._trim_start = s / sr
+        self._trim_end   = e / sr
+
+    def sync_handles(self):
+        self._load_trim()
         self._draw()
 
     def get_trim(self):
@@ -177,10 +263,6 @@ def open_editor(parent, sound_name: str, sounds: dict, on_close=None):
         sound = sounds[sound_name]
         init_sound_effects(sound)
 
-        # Keep an untouched backup for full reset
-        if "_editor_backup" not in sound:
-            sound["_editor_backup"] = sound["original_data"].copy()
-
         win = tk.Toplevel(parent)
         win.title(f"Sound Editor  –  {sound_name}")
         win.geometry("820x660")
@@ -199,12 +281,26 @@ def open_editor(parent, sound_name: str, sounds: dict, on_close=None):
         dur_lbl.pack(side="left", padx=8)
 
         def _update_dur():
-            secs = len(sound["data"]) / _get_sr()
-            orig = len(sound["original_data"]) / _get_sr()
+            secs = playback_seconds(sound)
+            orig = len(sound["source"]) / _get_sr()
             dur_lbl.config(text=f"{secs:.2f}s  (original: {orig:.2f}s)")
 
         _update_dur()
 
+        def _when_rendered(fn):
+            """Run fn once the sound's pending edits have been applied."""
+            if not win.winfo_exists():
+                return
+            if is_rendering(sound):
+                dur_lbl.config(text="rendering…")
+                win.after(30, lambda: _when_rendered(fn))
+            else:
+                fn()
+
+        def _after_trim():
+            wf.sync_handles()
+            _update_dur()
+
         # ── MAIN AREA  (two columns via two side-by-side frames, using pack)
         main = tk.Frame(win, bg=_c("BG"))
         main.pack(fill="both", expand=True, padx=14, pady=10)
@@ -238,14 +334,11 @@ def open_editor(parent, sound_name: str, sounds: dict, on_close=None):
                                        parent=win)
                 return
             trim_sound(sound, s, e)
-            wf.reset_handles()
-            _update_dur()
+            _when_rendered(_after_trim)
 
         def _reset_trim():
-            if "_editor_backup" in sound:
-                reset_trim(sound, sound["_editor_backup"])
-                wf.reset_handles()
-                _update_dur()
+            reset_trim(sound)
+            _when_rendered(_after_trim)
 
         for txt, cmd, bg_n, hov_n in [
             ("✂  Apply Trim",        _apply_trim,  "ACCENT", "BTN_HOVER"),
@@ -266,6 +359,23 @@ def open_editor(parent, sound_name: str, sounds: dict, on_close=None):
         tk.Label(pci, text="Effect Parameters",
                  bg=_c("CARD"), fg=_c("TXT"), font=_c("FONT_HEADING")).pack(anchor="w", pady=(0, 8))
 
+        # Slider ticks are coalesced: the latest value of each parameter is
+        # applied at most once per frame instead of on every tick.
+        pending   = {}
+        flush_job = [None]
+
+        def _flush_params():
+            flush_job[0] = None
+            if pending:
+                set_effect_params(sound, dict(pending))
+                pending.clear()
+                _when_rendered(_update_dur)
+
+        def _queue_param(p, v):
+            pending[p] = v
+            if flush_job[0] is None:
+                flush_job[0] = win.after(16, _flush_params)
+
         def _param_slider(label, param, lo, hi, default):
             f  = tk.Frame(pci, bg=_c("CARD")); f.pack(fill="x", pady=(0, 6))
             lf = tk.Frame(f,   bg=_c("CARD")); lf.pack(fill="x")
@@ -280,7 +390,7 @@ def open_editor(parent, sound_name: str, sounds: dict, on_close=None):
                           highlightthickness=0, showvalue=0)
             sl.set(current)
             def _cmd(v, p=param, lbl=vl):
-                set_effect_param(sound, p, float(v))
+                _queue_param(p, float(v))
                 lbl.config(text=f"{float(v):.2f}")
             sl.config(command=_cmd)
             sl.pack(fill="x")
@@ -288,6 +398,25 @@ def open_editor(parent, sound_name: str, sounds: dict, on_close=None):
         _param_slider("Echo Delay (s)",   "echo_delay",    0.05, 1.5,  0.30)
         _param_slider("Echo Decay",        "echo_decay",    0.0,  1.0,  0.50)
         _param_slider("Fade Duration (s)", "fade_duration", 0.05, 5.0,  0.50)
+        _param_slider("Speed (×)",         "speed",  SPEED_MIN, SPEED_MAX, 1.50)
+        _param_slider("Reverb Wet / Dry",  "reverb_mix",    0.0,  1.0,  0.30)
+
+        # Reverb impulse response: built-in "Room" plus files in impulses/
+        irf = tk.Frame(pci, bg=_c("CARD")); irf.pack(fill="x", pady=(0, 6))
+        tk.Label(irf, text="Reverb Impulse", bg=_c("CARD"), fg=_c("SUBTXT"),
+                 font=_c("FONT_SMALL")).pack(side="left")
+        irs    = list_impulses()
+        ir_var = tk.StringVar(value=sound["effect_params"].get("reverb_ir") or DEFAULT_IR)
+        if ir_var.get() not in irs:
+            irs.append(ir_var.get())
+        ir_om = tk.OptionMenu(irf, ir_var, *irs,
+                              command=lambda v: _queue_param("reverb_ir", v))
+        ir_om.config(bg=_c("BTN"), fg=_c("TXT"), font=_c("FONT_SMALL"),
+                     highlightthickness=0, relief="flat",
+                     activebackground=_c("BTN_HOVER"), padx=8, pady=2)
+        ir_om["menu"].config(bg=_c("BTN"), fg=_c("TXT"), font=_c("FONT_SMALL"),
+                             activebackground=_c("BTN_HOVER"))
+        ir_om.pack(side="right")
 
         # ── RIGHT: effect toggles ─────────────────────────────
         tk.Label(right, text="Effects",
@@ -318,7 +447,7 @@ def open_editor(parent, sound_name: str, sounds: dict, on_close=None):
                 T.style_button(btn,
                                bg=_c("SUCCESS_GLOW") if new_on else _c("BTN"),
                                hover_bg=_c("SUCCESS") if new_on else _c("BTN_HOVER"))
-                _update_dur()
+                _when_rendered(_update_dur)
 
             b.config(command=_toggle)
             T.style_button(b,
@@ -339,6 +468,7 @@ def open_editor(parent, sound_name: str, sounds: dict, on_close=None):
                  font=_c("FONT_SMALL")).pack(side="left", padx=(0, 16))
 
         def _done():
+            _flush_params()
             win.destroy()
             if on_close:
                 try: on_close()